@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+from editor import RE5SaveData, RE5SavePatch, SIZE_MIN, SIZE_MAX
+from layout import BLOCKS, LAYOUT, TABLES
+from descr import field_enum
+from scan import find_files
+
+# Edit spec is a JSON list (or {"edits": [...]}) of entries like:
+#   {"offset": "0x194", "size": 4, "value": 9999999}    integer field
+#   {"offset": "0x148", "bit": 3, "value": 1}           single bit of a flag block
+#   {"offset": "0x158", "bits": [0, 1, 2], "value": 1}  several bits of a flag block
+#   {"offset": "0x3d80", "bytes": "0201"}               raw bytes, hex encoded
+#   {"field": "inventory.chris[0].item", "value": 258}  named field from layout.py
+#   {"field": "current.area", "value": "6–3 Volcano"}   enum fields also take the GUI label
+#   {"block": "shop", "op": "set_all"}                  whole flag block from layout.BLOCKS,
+#                                                       "op" is set_all or clear_all
+#   {"block": "bonus", "bits": [0, 2], "value": 1}      some flags of a block
+#   {"block": "figures", "and": "0x0", "or": "0x7"}     (block & and) | or, "and" defaults to all ones
+#   {"table": "inventory.chris", "column": "damage", "value": 10}
+#                                                       one column of layout.TABLES, every row
+#                                                       or only "rows": [0, 1, ...]
+# Offsets may be integers or hex strings. Blocks may also be given as "offset" plus "count".
+
+def parse_int(value):
+    if type(value) is str:
+        return int(value, 0)
+    return int(value)
+
+def parse_value(name, value):
+    # Enum fields (descr.FIELD_ENUMS) also take the label shown in the GUI
+    enum = field_enum(name)
+    if enum is not None:
+        return enum.value(value)
+    return parse_int(value)
+
+def parse_mask(entry):
+    if 'block' in entry:
+        offset, count = BLOCKS[entry['block']]
+    else:
+        offset, count = parse_int(entry['offset']), parse_int(entry['count'])
+    if 'bits' in entry:
+        count = max(count, max(parse_int(bit) for bit in entry['bits']) + 1)
+    length = (count + 7) // 8
+    flags = (1 << count) - 1
+    if entry.get('op') == 'set_all':
+        return ('mask', offset, length, -1, flags)
+    if entry.get('op') == 'clear_all':
+        return ('mask', offset, length, ~flags, 0)
+    if 'bits' in entry:
+        mask = 0
+        for bit in entry['bits']:
+            mask |= 1 << parse_int(bit)
+        if parse_int(entry['value']):
+            return ('mask', offset, length, -1, mask)
+        return ('mask', offset, length, ~mask, 0)
+    if 'and' in entry or 'or' in entry:
+        return ('mask', offset, length, parse_int(entry.get('and', -1)) | ~flags, parse_int(entry.get('or', 0)) & flags)
+    raise ValueError(f'Flag block edit needs "op", "bits" or "and"/"or": {entry}')
+
+def parse_edit(entry):
+    if 'table' in entry:
+        table = TABLES[entry['table']]
+        column_offset, size = table.columns[entry['column']]
+        value = parse_value(f'{table.name}[0].{entry["column"]}', entry['value'])
+        if value < 0 or value >= 2 ** (size*8):
+            raise ValueError(f'Value {value} does not fit in column "{entry["column"]}"')
+        rows = tuple(parse_int(row) for row in entry.get('rows', range(table.count)))
+        return ('column', table.name, entry['column'], value, rows)
+    if 'block' in entry or 'count' in entry:
+        return parse_mask(entry)
+    if 'field' in entry:
+        field = LAYOUT[entry['field']]
+        value = parse_value(field.name, entry['value'])
+        bits = 1 if field.bit is not None else field.size * 8 * len(field.spans)
+        if value < 0 or value >= 2 ** bits:
+            raise ValueError(f'Value {value} does not fit in field "{field.name}"')
+        return ('field', field.name, value)
+    offset = parse_int(entry['offset'])
+    if 'bytes' in entry:
+        return ('bytes', offset, bytes.fromhex(entry['bytes']))
+    value = parse_int(entry['value'])
+    if 'bit' in entry:
+        entry = dict(entry, bits=[entry['bit']], count=0)
+    if 'bits' in entry:
+        return parse_mask(dict(entry, count=entry.get('count', 0)))
+    size = parse_int(entry.get('size', 1))
+    if value < 0 or value >= 2 ** (size*8):
+        raise ValueError(f'Value {value} does not fit in {size} byte(s) at {hex(offset)}')
+    return ('value', offset, size, value)
+
+def load_spec(filename):
+    with open(filename, encoding='utf-8') as file:
+        spec = json.load(file)
+    if type(spec) is dict:
+        spec = spec['edits']
+    return [parse_edit(entry) for entry in spec]
+
+def apply_edits(savedata, edits):
+    for edit in edits:
+        kind, offset = edit[0], edit[1]
+        if kind == 'column':
+            TABLES[edit[1]].write_column(savedata, edit[2], edit[3], edit[4])
+        elif kind == 'field':
+            LAYOUT.set(savedata, edit[1], edit[2])
+        elif kind == 'value':
+            savedata.set_value(edit[3], offset, edit[2])
+        elif kind == 'mask':
+            savedata.apply_mask(offset, edit[2], edit[3], edit[4])
+        elif kind == 'bytes':
+            savedata.set_bytes(edit[2], offset, len(edit[2]))
+
+def process(job):
+    # job: (source, destination, transform, patch). transform(savedata) makes the edits;
+    # it goes to a worker process, so it has to pickle: a module-level function or a
+    # functools.partial of one.
+    src, dst, transform, patch = job
+    try:
+        size = os.path.getsize(src)
+        if size < SIZE_MIN or size > SIZE_MAX:
+            return src, 'wrong-size', size
+        if patch:
+            # XORs the edits into the encoded file where it is, no decode/encode of the whole save
+            with RE5SavePatch(src) as savedata:
+                if not savedata.check_signature():
+                    return src, 'wrong-signature', size
+                transform(savedata)
+            return src, 'ok', size
+        savedata = RE5SaveData()
+        savedata.open_file(src)
+        if not savedata.check_signature():
+            return src, 'wrong-signature', size
+        transform(savedata)
+        os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+        savedata.save_file(dst)
+        return src, 'ok', size
+    except Exception as error:
+        return src, f'error: {error}', 0
+
+def add_job_arguments(parser):
+    # The file selection and output options run() expects, shared with presets.py and delta.py
+    parser.add_argument('paths', nargs='+', help='save files or directories to search')
+    parser.add_argument('-o', '--output', help='output directory (default: edit files in place)')
+    parser.add_argument('-p', '--pattern', default='*.bin', help='file name pattern inside directories (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--patch', action='store_true', help='patch the encoded files in place through mmap; faster for small edits, but not atomic')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only print failures and the summary')
+
+def run(parser, args, transform):
+    # Applies transform to every file found, over a process pool, and prints the status
+    # of each file and a summary. Returns the exit code.
+    if args.patch and args.output:
+        parser.error('--patch edits files in place and cannot be used with --output')
+    jobs = []
+    for src, rel in find_files(args.paths, args.pattern):
+        dst = os.path.join(args.output, rel) if args.output else src
+        jobs.append((src, dst, transform, args.patch))
+
+    start = perf_counter()
+    done, failed, total_bytes = 0, 0, 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        for src, status, size in executor.map(process, jobs, chunksize=max(1, len(jobs) // 256)):
+            if status == 'ok':
+                done += 1
+                total_bytes += size
+                if not args.quiet:
+                    print(f'ok     {src}')
+            else:
+                failed += 1
+                print(f'FAILED {src}: {status}')
+    elapsed = perf_counter() - start
+
+    rate = len(jobs) / elapsed if elapsed else 0.0
+    mbps = total_bytes / elapsed / 2**20 if elapsed else 0.0
+    print(f'{done} ok, {failed} failed, {len(jobs)} files in {elapsed:.2f}s ({rate:.0f} files/s, {mbps:.1f} MiB/s)')
+    return 1 if failed else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply an edit spec to many RE5 save files.')
+    parser.add_argument('spec', help='JSON edit spec')
+    add_job_arguments(parser)
+    args = parser.parse_args(argv)
+    return run(parser, args, partial(apply_edits, edits=load_spec(args.spec)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+import editor
+from editor import RE5SaveData, SIGNATURE_OFFSET, SIGNATURE_COPIES, SIZE_MIN, SIZE_MAX
+from layout import LAYOUT
+from descr import dict_area, dict_difficulty, dict_treasure, dict_weapons, frames
+
+# Benchmarks for the codec, checksum, bit access and the GUI populate/save cycle.
+# Results are printed as JSON so runs of different versions can be diffed.
+
+LAYOUT_END = max(offset + size for field in LAYOUT for offset, size in field.spans)
+SAVE_SIZE = 23900 # A valid save size that holds every layout field
+assert SIZE_MIN <= SAVE_SIZE <= SIZE_MAX and SAVE_SIZE >= LAYOUT_END
+
+def synthetic_save(seed=None, size=SAVE_SIZE):
+    # Random bytes with plausible values in the known fields, a valid signature and checksum
+    rng = random.Random(seed)
+    savedata = RE5SaveData()
+    savedata.data = bytearray(rng.getrandbits(8) for i in range(size))
+    record = {
+        'steam_id': rng.getrandbits(32),
+        'playtime': rng.randrange(3600, 360000),
+        'money': rng.randrange(0, 10000000),
+        'exchange_points': rng.randrange(0, 10000000),
+        'current.state': rng.randrange(3),
+        'current.character': rng.randrange(2),
+        'current.difficulty': rng.choice(list(dict_difficulty.values())),
+        'current.area': rng.choice(list(dict_area.values())),
+    }
+    for field in LAYOUT:
+        if field.name.endswith('].item'):
+            table = dict_treasure if field.name.startswith('treasure') else dict_weapons
+            record[field.name] = rng.choice(list(table.values()))
+    LAYOUT.write(savedata, record)
+    signature = savedata.get_bytes(SIGNATURE_OFFSET, 8)
+    for offset in SIGNATURE_COPIES:
+        savedata.set_bytes(signature, offset, 8)
+    savedata.update_checksum()
+    return savedata
+
+def write_corpus(directory, count, seed=0):
+    # Files share one synthetic save with a few fields varied, which keeps generation fast
+    base = synthetic_save(seed)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        base.set_value(rng.randrange(0, 10000000), 0x194, 4)
+        base.set_value(rng.getrandbits(32), 0x0, 4)
+        path = os.path.join(directory, f'{i // 1000:03d}', f'savedata{i}.bin')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        base.save_file(path)
+        paths.append(path)
+    return paths
+
+def measure(function, number, repeat):
+    best = None
+    for i in range(repeat):
+        start = perf_counter()
+        for j in range(number):
+            function()
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return {'number': number, 'repeat': repeat, 'best': best, 'per_call': best / number}
+
+def gui_fields():
+    names = []
+    for fframe in frames.values():
+        for row in fframe:
+            for cell in row:
+                name = getattr(cell, 'name', None)
+                if name is not None:
+                    names.append(name)
+    return names
+
+def bench_single(directory, repeat):
+    path = os.path.join(directory, 'single.bin')
+    out = os.path.join(directory, 'single-out.bin')
+    synthetic_save(1).save_file(path)
+    savedata = RE5SaveData()
+    savedata.open_file(path)
+    bits = [(field.offset, field.bit) for field in LAYOUT if field.bit is not None]
+    names = gui_fields()
+
+    def get_bits():
+        for offset, bit in bits:
+            savedata.get_bit(offset, bit)
+
+    def set_bits():
+        for offset, bit in bits:
+            savedata.set_bit(offset, bit, 1)
+
+    def populate_and_save():
+        # What the GUI does for a full form: read every cell, write every cell back, save
+        record = LAYOUT.read(savedata)
+        values = {name: record[name] for name in names}
+        LAYOUT.write(savedata, values)
+        savedata.save_file(out)
+        assert len(savedata.data) == SAVE_SIZE, 'populate/save changed the size of the save'
+
+    view = editor.RE5SaveView(path)
+    results = {
+        'open_file': measure(lambda: RE5SaveData().open_file(path), 100, repeat),
+        'save_file': measure(lambda: savedata.save_file(out), 100, repeat),
+        'calculate_checksum': measure(savedata.calculate_checksum, 200, repeat),
+        'update_checksum': measure(savedata.update_checksum, 2000, repeat),
+        'get_bit': measure(get_bits, 20, repeat),
+        'set_bit': measure(set_bits, 20, repeat),
+        'layout_read': measure(lambda: LAYOUT.read(savedata), 200, repeat),
+        'populate_and_save': measure(populate_and_save, 50, repeat),
+        'view_summary': measure(lambda: (view.get_value(0x0, 4), view.get_value(0x194, 4), view.get_value(0x3bc0, 4)), 2000, repeat),
+    }
+    view.close()
+    for name in ('get_bit', 'set_bit'):
+        results[name]['per_call'] /= len(bits)
+    results['get_bit']['bits'] = results['set_bit']['bits'] = len(bits)
+    results['populate_and_save']['fields'] = len(names)
+    return results
+
+def bench_corpus(directory, count):
+    corpus = os.path.join(directory, f'corpus-{count}')
+    start = perf_counter()
+    paths = write_corpus(corpus, count)
+    generate = perf_counter() - start
+
+    start = perf_counter()
+    for path in paths:
+        savedata = RE5SaveData()
+        savedata.open_file(path)
+        savedata.verify_checksum()
+        savedata.set_value(9999999, 0x194, 4)
+        savedata.save_file(path)
+    cycle = perf_counter() - start
+
+    start = perf_counter()
+    for path in paths:
+        with editor.RE5SaveView(path) as view:
+            view.get_value(0x194, 4)
+    summary = perf_counter() - start
+
+    start = perf_counter()
+    for path in paths:
+        with editor.RE5SavePatch(path) as patch:
+            patch.set_value(1234567, 0x194, 4)
+    patched = perf_counter() - start
+
+    shutil.rmtree(corpus)
+    return {
+        'files': count,
+        'generate': generate,
+        'open_verify_edit_save': cycle,
+        'open_verify_edit_save_files_per_s': count / cycle,
+        'view_summary': summary,
+        'view_summary_files_per_s': count / summary,
+        'patch_in_place': patched,
+        'patch_in_place_files_per_s': count / patched,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the save editor core.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='repeats per single-file benchmark, best is kept (default: %(default)s)')
+    parser.add_argument('-c', '--corpus', type=int, nargs='*', default=[], help='corpus sizes to run, e.g. 1000 10000 100000')
+    parser.add_argument('-o', '--output', help='write JSON results to this file instead of stdout')
+    parser.add_argument('--dir', help='scratch directory (default: a temporary directory)')
+    args = parser.parse_args(argv)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': editor.np.__version__ if editor.np is not None else None,
+        },
+    }
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        results['single'] = bench_single(directory, args.repeat)
+        results['corpus'] = [bench_corpus(directory, count) for count in args.corpus]
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import argparse
+import fnmatch
+import os
+import struct
+import sys
+import zlib
+from dataclasses import dataclass
+from functools import partial
+from batch import add_job_arguments, run
+from editor import RE5SaveData, CHECKSUM_OFFSET, np
+from layout import LAYOUT
+
+# Binary edit deltas: the difference between two decoded saves, to be applied to
+# other people's saves. Layout, little-endian:
+#   header  "RE5D", version (u8), record count (u32)
+#   record  offset (u16), length (u16), kind (u8), then two byte strings of that length:
+#           kind 0: expected base bytes, new bytes
+#           kind 1: AND mask, OR mask (flag bytes; only the bits that changed are touched)
+#   footer  CRC-32 of everything before it (u32)
+# The checksum word and personal fields (SteamID, playtime, last save time) are left out.
+
+MAGIC = b'RE5D'
+VERSION = 1
+HEADER = struct.Struct('<4sBI')
+RECORD = struct.Struct('<HHB')
+FOOTER = struct.Struct('<I')
+PLAIN, MASK = 0, 1
+MASK_GAP = 4 # Unchanged flag bytes a mask record may span to save a record header
+PERSONAL = ('steam_id', 'playtime', 'last_save.*')
+
+@dataclass(frozen=True)
+class Record:
+    offset: int
+    kind: int
+    first: bytes # Expected base bytes, or the AND mask
+    second: bytes # New bytes, or the OR mask
+
+    @property
+    def length(self):
+        return len(self.first)
+
+class DeltaError(ValueError):
+    pass
+
+class DeltaConflict(DeltaError):
+    def __init__(self, records):
+        super().__init__(f'{len(records)} record(s) do not match the expected base, first at {hex(records[0].offset)}')
+        self.records = records
+
+def excluded_offsets(personal=PERSONAL):
+    offsets = set(range(CHECKSUM_OFFSET, CHECKSUM_OFFSET + 4))
+    for field in LAYOUT:
+        if any(fnmatch.fnmatchcase(field.name, pattern) for pattern in personal):
+            for offset, size in field.spans:
+                offsets.update(range(offset, offset + size))
+    return offsets
+
+EXCLUDED = excluded_offsets()
+FLAG_BYTES = frozenset(offset for field in LAYOUT if field.bit is not None for offset, size in field.spans)
+
+def changed_offsets(base, edited):
+    if np is not None:
+        return np.flatnonzero(np.frombuffer(base, np.uint8) != np.frombuffer(edited, np.uint8)).tolist()
+    return [i for i, (a, b) in enumerate(zip(base, edited)) if a != b]
+
+def diff(base, edited, excluded=EXCLUDED):
+    # Records turning the decoded buffer base into edited. Changed flag bytes become
+    # mask records, everything else plain records of consecutive changed bytes.
+    if len(base) != len(edited):
+        raise DeltaError(f'Saves differ in size ({len(base)} and {len(edited)} bytes)')
+    runs = []
+    for offset in changed_offsets(base, edited):
+        if offset in excluded:
+            continue
+        kind = MASK if offset in FLAG_BYTES else PLAIN
+        if runs and runs[-1][0] == kind:
+            gap = offset - runs[-1][2]
+            if gap == 0 or (kind == MASK and gap <= MASK_GAP and all(i in FLAG_BYTES for i in range(runs[-1][2], offset))):
+                runs[-1][2] = offset + 1
+                continue
+        runs.append([kind, offset, offset + 1])
+
+    records = []
+    for kind, start, end in runs:
+        old, new = bytes(base[start:end]), bytes(edited[start:end])
+        if kind == PLAIN:
+            records.append(Record(start, PLAIN, old, new))
+        else:
+            cleared = bytes(a & ~b & 0xFF for a, b in zip(old, new))
+            records.append(Record(start, MASK, bytes(~c & 0xFF for c in cleared), bytes(b & ~a & 0xFF for a, b in zip(old, new))))
+    return records
+
+def dumps(records):
+    parts = [HEADER.pack(MAGIC, VERSION, len(records))]
+    for record in records:
+        parts.append(RECORD.pack(record.offset, record.length, record.kind))
+        parts.append(record.first)
+        parts.append(record.second)
+    data = b''.join(parts)
+    return data + FOOTER.pack(zlib.crc32(data))
+
+def loads(data):
+    if len(data) < HEADER.size + FOOTER.size:
+        raise DeltaError('Not a save delta: too short')
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise DeltaError('Not a save delta')
+    if version != VERSION:
+        raise DeltaError(f'Unsupported delta version {version}')
+    if FOOTER.unpack_from(data, len(data) - FOOTER.size)[0] != zlib.crc32(data[ : -FOOTER.size ]):
+        raise DeltaError('Delta is damaged: CRC mismatch')
+    records = []
+    position = HEADER.size
+    for i in range(count):
+        offset, length, kind = RECORD.unpack_from(data, position)
+        position += RECORD.size
+        if kind not in (PLAIN, MASK):
+            raise DeltaError(f'Unknown record kind {kind} at {hex(offset)}')
+        records.append(Record(offset, kind, bytes(data[ position : position+length ]), bytes(data[ position+length : position+2*length ])))
+        position += 2 * length
+    if position != len(data) - FOOTER.size:
+        raise DeltaError('Delta is damaged: record sizes do not add up')
+    return records
+
+def load(filename):
+    with open(filename, 'rb') as file:
+        return loads(file.read())
+
+def save(filename, records):
+    with open(filename, 'wb') as file:
+        file.write(dumps(records))
+
+def apply(savedata, records, force=False):
+    # One pass over the records, written as one set_many: one undo step, with the running
+    # checksum updated on the way (save_file or RE5SavePatch.flush store it). Plain records
+    # whose target bytes are neither the base nor already the new bytes are conflicts:
+    # DeltaConflict is raised before anything is written, unless force is set.
+    # Returns the number of records that changed something.
+    with savedata.lock:
+        items = []
+        conflicts = []
+        size = len(savedata.data) if savedata.data is not None else len(savedata)
+        for record in records:
+            if record.offset + record.length > size:
+                raise DeltaError(f'Record at {hex(record.offset)} is past the end of the save')
+            current = savedata.get_bytes(record.offset, record.length)
+            if record.kind == MASK:
+                value = (int.from_bytes(current, 'little') & int.from_bytes(record.first, 'little')) | int.from_bytes(record.second, 'little')
+                new = value.to_bytes(record.length, 'little')
+            else:
+                new = record.second
+                if current != record.first and current != new:
+                    conflicts.append(record)
+            if new != current:
+                items.append((new, record.offset, record.length))
+        if conflicts and not force:
+            raise DeltaConflict(conflicts)
+        savedata.set_many(items)
+        return len(items)
+
+def describe(record):
+    # Names of the layout fields a record touches
+    end = record.offset + record.length
+    names = [field.name for field in LAYOUT if any(offset < end and record.offset < offset + size for offset, size in field.spans)]
+    if len(names) > 4:
+        names = names[:3] + [f'... {len(names) - 3} more']
+    return ', '.join(names)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create and apply binary deltas between RE5 saves.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    diff_parser = commands.add_parser('diff', help='write the changes from BASE to EDITED as a delta')
+    diff_parser.add_argument('base')
+    diff_parser.add_argument('edited')
+    diff_parser.add_argument('-o', '--output', required=True, help='delta file to write')
+    diff_parser.add_argument('--personal', action='store_true', help='also include SteamID, playtime and last save time')
+    apply_parser = commands.add_parser('apply', help='apply a delta to save files')
+    apply_parser.add_argument('delta')
+    add_job_arguments(apply_parser)
+    apply_parser.add_argument('-f', '--force', action='store_true', help='apply records even where the save does not match the expected base')
+    show_parser = commands.add_parser('show', help='list the records of a delta')
+    show_parser.add_argument('delta')
+    args = parser.parse_args(argv)
+
+    if args.command == 'diff':
+        saves = []
+        for path in (args.base, args.edited):
+            savedata = RE5SaveData()
+            savedata.open_file(path)
+            saves.append(savedata.data)
+        records = diff(*saves, excluded={CHECKSUM_OFFSET + i for i in range(4)} if args.personal else EXCLUDED)
+        save(args.output, records)
+        print(f'{len(records)} records, {os.path.getsize(args.output)} bytes')
+        return 0
+
+    records = load(args.delta)
+    if args.command == 'show':
+        for record in records:
+            kind = 'mask' if record.kind == MASK else 'bytes'
+            print(f'{hex(record.offset):>7} {record.length:>4} {kind:<5}  {record.first.hex()} -> {record.second.hex()}  {describe(record)}')
+        return 0
+
+    return run(apply_parser, args, partial(apply, records=records, force=args.force))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
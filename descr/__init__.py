@@ -0,0 +1,7 @@
+# Field descriptions for the editor GUI: enum tables, widget descriptions and the
+# frames/tabs layout. Importing this package does not import tkinter.
+from .enums import *
+from .widgets import D, DCheckbutton, DClick, DCombobox, DEntry, DLabel, DSeparator, DTabFrame, dirty
+from .frames import frames, tabs, make_descr_checkarray, make_descr_invenventory, make_descr_levels, make_descr_treasures
+
+IMPORT_BUDGET = 0.1 # Seconds for `import descr` in a fresh interpreter, checked by `python -m descr`
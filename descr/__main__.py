@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+from descr import IMPORT_BUDGET
+
+# Measures `import descr` in fresh interpreters and fails if it is over budget or pulls in tkinter
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import descr
+print(time.perf_counter() - start, 'tkinter' in sys.modules)
+'''
+
+def measure(runs=5):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', PROBE], cwd=root, text=True)
+        seconds, tkinter_loaded = output.split()
+        if tkinter_loaded == 'True':
+            raise RuntimeError('importing descr loaded tkinter')
+        times.append(float(seconds))
+    return min(times)
+
+if __name__ == '__main__':
+    seconds = measure()
+    print(f'import descr: {seconds*1000:.1f} ms (budget {IMPORT_BUDGET*1000:.0f} ms)')
+    sys.exit(0 if seconds <= IMPORT_BUDGET else 1)
@@ -0,0 +1,94 @@
+list_cutscenes = ["No.01 Welcome to Africa", "No.02 Magic Act", "No.03 The Butcher (Part 1)", "No.04 The Butcher (Part 2)", "No.05 First Encounter", "No.06 Hospitality", "No.07 Guardian Angel", "No.08 A Cry for Help", "No.09 Damsel in Distress", "No.10 A Piece of the Puzzle", "No.11 Unidentified Threat", "No.12 The Storage Facility", "No.13 The Chainsaw Majini", "No.14 To the Crash Site!", "No.15 Rendezvous", "No.16 Irving's Great Escape", "No.17 Terror from Above", "No.18 Roll Out!", "No.19 Shaking Off the Majini", "No.20 Grand Resurgence", "No.21 Delta Team's Distress", "No.22 The Wetlands", "No.23 Shadows of the Past", "No.24 Josh to the Rescue", "No.25 Splitting Up", "No.26 Irving's Web", "No.27 The Oil Field Aflame", "No.28 Boat Majini Appear", "No.29 The Patrol Boat", "No.30 A New Clue", "No.31 The Docks", "No.32 The Bridge Collapses", "No.33 Wesker's Return", "No.34 Underground Garden", "No.35 Experimental Facility", "No.36 U-8 Attacks", "No.37 U-8 Repelled", "No.38 Monitored Communications", "No.39 Uroboros", "No.40 Two on Two", "No.41 Old Friends, New Enemies", "No.42 Favor for a Friend", "No.43 The Tanker", "No.44 Medicine", "No.45 Dreams of a Madman", "No.46 A New Nightmare Begins", "No.47 A Message from Jill", "No.48 Rematch", "No.49 Wesker's Vulnerability", "No.50 Sky-high Skirmish", "No.51 The Final Curtain", "No.52 The Fall of Wesker", "No.53 Homeward Bound!"]
+list_infammo = ["M92F", "H&K P8", "SIG P226", "M93R", "Ithaca M37", "M3", "Jail Breaker", "Hydra", "VZ61", "AK-74", "H&K MP5", "SIG 556", "S75", "Dragunov SVD", "H&K PSG-1", "S&W M29", "Lightning Hawk", "S&W M500", "Rocket launcher"]
+list_figures = ["No.01 Chris (BSAA)", "No.02 Sheva (BSAA)", "No.03 Josh", "No.04 Jill (Brainwashed)", "No.05 Wesker", "No.06 Excella", "No.07 Irving", "No.08 Spencer", "No.09 DeChant", "No.10 Dave", "No.11 Kirk", "No.12 Reynard", "No.13 Majini (Town A)", "No.14 Majini (Town B)", "No.15 Majini (Town C)", "No.16 Majini (Town D)", "No.17 Majini (Cephalo)", "No.18 Majini (Agitator)", "No.19 Majini (Wetlands A)", "No.20 Majini (Wetlands B)", "No.21 Majini (Wetlands C)", "No.22 Giant Majini", "No.23 Majini (Base A)", "No.24 Majini (Base B)", "No.25 Majini (Duvalia)", "No.26 Reaper", "No.27 Big Man Majini", "No.28 Executioner Majini", "No.29 Chainsaw Majini", "No.30 Gatling gun Majini", "No.31 Motorcycle Majini", "No.32 Uroboros", "No.33 Licker", "No.34 Kipepeo", "No.35 Bui Kichwa", "No.36 Adjule", "No.37 Crocodile", "No.38 Uroboros Aheri", "No.39 U-8", "No.40 Popokarimu", "No.41 Ndesu", "No.42 Irving (Transformed)", "No.43 Chris (Rare)", "No.44 Sheva (Rare)", "No.45 Jill (Rare)", "No.46 Wesker (Rare)"]
+list_files = ["No.01 History of RESIDENT EVIL", "No.02 BSAA", "No.03 Majini", "No.04 Chris Redfield", "No.05 Sheva Alomar", "No.06 Ricardo Irving", "No.07 Ndipaya Tribe", "No.08 U-8", "No.09 Tricell", "No.10 Jill Valentine", "No.11 Excella Gionne", "No.12 Albert Wesker"]
+list_shop = ['M92F (HG)', 'H&K P8 (HG)', 'SIG P226 (HG)', 'M93R (HG)', 'Ithaca M37 (SG)', 'M3 (SG)', 'Jail Breaker (SG)', 'Hydra (SG)', 'VZ61 (MG)', 'AK-74 (MG)', 'H&K MP5 (MG)', 'SIG 556 (MG)', 'S75 (RIF)', 'Dragunov SVD (RIF)', 'H&K PSG-1 (RIF)', 'S&W M29 (MAG)', 'Lightning Hawk (MAG)', 'S&W M500 (MAG)', 'Grenade launcher', 'Rocket launcher', 'Stun rod', 'Gatling gun', 'Longbow', 'Proximity bomb', 'Explosive rounds', 'Acid rounds', 'Nitrogen rounds', 'Flame rounds', 'Flash rounds', 'Electric rounds', 'First aid spray', 'Melee vest', 'Bulletproof vest']
+list_bonus = ['Chris Outfit (Safari)', 'Sheva Outfit (Clubbin\')', 'Chris Outfit (S.T.A.R.S.)', 'Sheva Outfit (Tribal)', '#separator', 'Filter (Classic Horror)', 'Filter (Retro)', 'Filter (Noise)', '#separator', 'Chris (BSAA) ', 'Sheva (BSAA) ', 'Josh  ', 'Jill (Brainwashed) ', 'Wesker  ', 'Excella  ', 'Irving  ', 'Spencer  ', 'DeChant  ', 'Dave  ', 'Kirk  ', 'Reynard  ', 'Majini (Town A)', 'Majini (Town B)', 'Majini (Town C)', 'Majini (Town D)', 'Majini (Cephalo) ', 'Majini (Agitator) ', 'Majini (Wetlands A)', 'Majini (Wetlands B)', 'Majini (Wetlands C)', 'Giant Majini ', 'Majini (Base A)', 'Majini (Base B)', 'Majini (Duvalia) ', 'Reaper  ', 'Big Man Majini', 'Executioner Majini ', 'Chainsaw Majini ', 'Gatling gun Majini', 'Motorcycle Majini ', 'Uroboros  ', 'Licker  ', 'Kipepeo  ', 'Bui Kichwa ', 'Adjule  ', 'Crocodile  ', 'Uroboros Aheri ', 'U-8  ', 'Popokarimu  ', 'Ndesu  ', 'Irving (Transformed) ', 'Chris (Rare) ', 'Sheva (Rare) ', 'Jill (Rare) ', 'Wesker (Rare) ']
+list_characters = ['A / Chris Redfield (Safari)', 'B / Chris Redfield (S.T.A.R.S.)', 'C / Sheva Alomar (Clubbin\')', 'D / Sheva Alomar (Tribal)', 'E / Jill Valentine (BSAA)', 'F / Jill Valentine (Battle suit)', 'G / Albert Wesker (Midnight)', 'H / Albert Wesker (S.T.A.R.S.)']
+dict_filter = {'Default': 0x0, 'Classic Horror': 0x1, 'Retro': 0x2, 'Noise': 0x3}
+dict_chriscostume = {'BSAA': 0x0, 'Safari': 0x1, 'S.T.A.R.S.': 0x2, 'Warrior': 0x300000000, 'Heavy Metal': 0x400000000, 'Plain': 0x900000000, 'Lost in Nightmares': 0xD00000000} # Extra 0xa - stars, 0xb - safari, 0xc - warrior
+dict_shevacostume = {'BSAA': 0x0, 'Clubbin\'': 0x1, 'Tribal': 0x2, 'Business': 0x300000000, 'Fairy Tale': 0x400000000}
+dict_weapons = {'None': 0, 'M92F (HG)': 258, 'H&K P8 (HG)': 272, 'SIG P226 (HG)': 273, 'M93R (HG)': 286, 'Px4 (HG)': 287, 'Samurai Edge (Wesker) (HG)': 297, 'Samurai Edge (Barry) (HG)': 274, 'Ithaca M37 (SG)': 260, 'M3 (SG)': 278, 'Jail Breaker (SG)': 279, 'Hydra (SG)': 281, 'VZ61 (MG)': 259, 'AK-74 (MG)': 285, 'H&K MP5 (MG)': 275, 'SIG 556 (MG)': 265, 'S75 (RIF)': 261, 'Dragunov SVD (RIF)': 288, 'H&K PSG-1 (RIF)': 284, 'S&W M29 (MAG)': 267, 'Lightning Hawk (MAG)': 282, 'S&W M500 (MAG)': 283, 'Grenade launcher (EXP)': 293, 'Grenade launcher (ACD)': 294, 'Grenade launcher (ICE)': 295, 'Grenade launcher (FLM)': 313, 'Grenade launcher (FLS)': 314, 'Grenade launcher (ELC)': 315, 'Grenade launcher (INV)': 268, 'Rocket launcher': 269, 'Rocket launcher (Inf.)': 312, 'Stun rod': 290, 'Gatling gun': 277, 'Longbow': 271, 'Flamethrower': 289, 'L.T.D.': 308, 'RPG-7 NVS': 309, 'Knife (Chris)': 257, 'Knife (Sheva)': 270, 'Knife (Josh)': 276, 'Knife (Wesker)': 291, 'Knife (Jill)': 292, 'Hand-to-hand': 311, 'Hand grenade': 262, 'Incendiary grenade': 263, 'Flash grenade': 264, 'Proximity bomb': 266, 'Egg (White)': 316, 'Egg (Brown)': 317, 'Egg (Golden)': 318, 'Egg (Rotten)': 310, 'Handgun ammo': 513, 'Machine gun ammo': 514, 'Shotgun sells': 515, 'Riffle ammo': 516, 'Magnum ammo': 521, 'Explosive rounds': 518, 'Acid rounds': 519, 'Nitrogen rounds': 520, 'Flame rounds': 526, 'Flash rounds': 527, 'Electric rounds': 528, 'RPG round': 529, 'First aid spray': 772, 'Herb (Green)': 773, 'Herb (Red)': 774, 'Herb (G+G)': 775, 'Herb (G+R)': 777, 'Melee vest': 1537, 'Bulletproof vest': 1542}
+dict_treasure = {'None': 0x0, 'Gold ring': 0x417, 'Ivory relief': 0x420, 'Dead bride\'s necklace': 0x418, 'Royal necklace': 0x423, 'Jewel bangle': 0x424, 'Venom fang': 0x419, 'Antique clock': 0x41a, 'Chalice (Silver)': 0x41b, 'Chalice (Gold)': 0x41c, 'Idol (Silver)': 0x41d, 'Idol (Gold)': 0x41e, 'Ceremonial mask': 0x41f, 'Jewel beetle': 0x422, 'Beetle (Brown)': 0x421, 'Beetle (Gold)': 0x425, 'Topaz (Pear)': 0x450, 'Ruby (Pear)': 0x451, 'Sapphire (Pear)': 0x452, 'Emerald (Pear)': 0x453, 'Diamond (Pear)': 0x454, 'Topaz (Square)': 0x457, 'Ruby (Square)': 0x458, 'Sapphire (Square)': 0x459, 'Emerald (Square)': 0x45a, 'Diamond (Square)': 0x45b, 'Topaz (Oval)': 0x45e, 'Ruby (Oval)': 0x45f, 'Sapphire (Oval)': 0x460, 'Emerald (Oval)': 0x461, 'Diamond (Oval)': 0x462, 'Topaz (Trilliant)': 0x465, 'Ruby (Trilliant)': 0x466, 'Sapphire (Trilliant)': 0x467, 'Emerald (Trilliant)': 0x468, 'Diamond (Trilliant)': 0x469, 'Topaz (Brilliant)': 0x47a, 'Ruby (Brilliant)': 0x47b, 'Sapphire (Brilliant)': 0x47c, 'Emerald (Brilliant)': 0x47d, 'Diamond (Brilliant)': 0x47e, 'Topaz (Marquise)': 0x473, 'Ruby (Marquise)': 0x474, 'Sapphire (Marquise)': 0x475, 'Emerald (Marquise)': 0x476, 'Diamond (Marquise)': 0x477, 'Power stone': 0x46c, 'Lion heart': 0x46d, 'Blue enigma': 0x46e, 'Soul gem': 0x46f, 'Heart of Africa': 0x470}
+dict_state = {'New Game': 0, 'Continue': 1, 'New Game +': 2}
+dict_character = {'Chris Redfield': 0x0, 'Sheva Alomar': 0x1}
+dict_difficulty = {'Amateur': 0, 'Normal': 1, 'Veteran': 2, 'Professional': 3}
+dict_chapter = {'1–1': 0, '1–2': 1, '2–1': 2, '2–2': 3, '2–3': 4, '3–1': 5, '3–2': 6, '3–3': 7, '4–1': 8, '4–2': 9, '5–1': 10, '5–2': 11, '5–3': 12, '6–1': 13, '6–2': 14, '6–3': 15, '6–4': 16}
+dict_area = {'1–1 Civilian Checkpoint': 0x06400000000, '1–1 Back alley': 0x07300000000, '1–1 Public Assembly': 0x07200000000, '1–2 Public Assembly': 0x07200000001, '1–2 Urban District': 0x06600000001, '1–2 Abandoned Building': 0x07500000001, '1–2 Furnace Facility': 0x06700000001, '2–1 Storage Facility': 0x07600000002, '2–1 The Bridge': 0x06800000002, '2–1 The Port': 0x07100000002, '2–1 Shanty Town': 0x06900000002, '2–1 Train Yard': 0x06a00000002, '2–2 Train Station': 0x07700000003, '2–2 The Mines': 0x06b00000003, '2–2 Mining Area': 0x06c00000003, '2–3 Savannah': 0x06d00000004, '2–3 The Port (Night)': 0x06f00000004, '3–1 Marshlands': 0x25e00000005, '3–1 m2': 0x0c800000005, '3–1 Village': 0x0ca00000005, '3–2 Execution Grounds': 0x0c900000006, '3–2 Oil Field - Refinery': 0x0cf00000006, '3–2 Oil Field - Control Facility': 0x0cb00000006, '3–2 Oil Field - Dock': 0x0d100000006, '3–3 Oil Field - Drilling Facilities': 0x0cc00000007, '3–3 Patrol Boat': 0x0cd00000007, '4–1 Caves': 0x13900000008, '4–1 Ancient Village': 0x12c00000008, '4–1 Labyrinth': 0x12d00000008, '4–2 Worship Area': 0x12e00000009, '4–2 Pyramid': 0x12f00000009, '4–2 Underground Garden': 0x13800000009, '5–1 Underground Garden': 0x1380000000A, '5–1 Progenitor Virus House': 0x1310000000A, '5–1 Experimental Facility': 0x1300000000A, '5–2 Experimental Facility': 0x1300000000B, '5–2 Power Station': 0x1360000000B, '5–2 Experimental Facility Passage': 0x13c0000000B, '5–2 Missile Area 1st Floor': 0x1330000000B, '5–2 Uroboros Research Facility': 0x1340000000B, '5–3 Uroboros Research Facility': 0x1340000000C, '5–3 Missile Area 2nd Floor': 0x13a0000000C, '5–3 Moving Platform': 0x13b0000000C, '5–3 Monarch Room': 0x1350000000C, '6–1 Ship Deck': 0x1f40000000D, '6–1 Ship Hold': 0x1f50000000D, '6–2 Main Deck': 0x1f70000000E, '6–2 Bridge': 0x1f80000000E, '6–2 Bridge Deck': 0x1ff0000000E, '6–3 Bridge Deck': 0x1ff0000000F, '6–3 Bridge': 0x2000000000F, '6–3 Engine Room': 0x1f90000000F, '6–3 Hangar': 0x1fa0000000F, '6–3 Volcano': 0x1fc0000000F, '6–4 Credits': 0x26300000010}
+
+class Enum:
+    # Compiled form of one of the tables above: value -> label and value -> position are
+    # dict lookups. Values missing from the table are shown as hex, like the GUI always did.
+    def __init__(self, name, options):
+        self.name = name
+        self.options = options
+        self.labels = list(options.keys())
+        self.values = list(options.values())
+        self.positions = {}
+        self.labels_by_value = {}
+        for position, (label, value) in enumerate(options.items()):
+            self.positions.setdefault(value, position)
+            self.labels_by_value.setdefault(value, label)
+
+    def __contains__(self, value):
+        return value in self.positions
+
+    def __len__(self):
+        return len(self.labels)
+
+    def position(self, value):
+        return self.positions.get(value)
+
+    def label(self, value):
+        label = self.labels_by_value.get(value)
+        return hex(value) if label is None else label
+
+    def value(self, label):
+        # Label from the table, or an int / "0x..." string for values outside it
+        if label in self.options:
+            return self.options[label]
+        if type(label) is str:
+            try:
+                return int(label, 0)
+            except ValueError:
+                raise ValueError(f'"{label}" is not in the {self.name} table') from None
+        return int(label)
+
+ENUMS = {enum.name: enum for enum in (
+    Enum('filter', dict_filter),
+    Enum('chris_costume', dict_chriscostume),
+    Enum('sheva_costume', dict_shevacostume),
+    Enum('weapons', dict_weapons),
+    Enum('treasure', dict_treasure),
+    Enum('state', dict_state),
+    Enum('character', dict_character),
+    Enum('difficulty', dict_difficulty),
+    Enum('chapter', dict_chapter),
+    Enum('area', dict_area), # Chapter in the low 32 bits, area id in the high 32 bits
+)}
+_compiled = {id(enum.options): enum for enum in ENUMS.values()}
+
+def enum_of(options):
+    # Registered Enum for one of the dicts above; other dicts are compiled once and kept
+    enum = _compiled.get(id(options))
+    if enum is None:
+        enum = _compiled[id(options)] = Enum(None, options)
+    return enum
+
+FIELD_ENUMS = {
+    # layout field name: ENUMS key
+    'chris_costume': 'chris_costume',
+    'sheva_costume': 'sheva_costume',
+    'filter': 'filter',
+    'current.state': 'state',
+    'current.character': 'character',
+    'current.difficulty': 'difficulty',
+    'current.area': 'area',
+    **{f'inventory.{name}[{i}].item': 'weapons' for name in ('chris', 'sheva') for i in range(10)},
+    **{f'treasure[{i}].item': 'treasure' for i in range(50)},
+}
+
+def field_enum(name):
+    # Enum of a layout field, or None for plain numbers
+    key = FIELD_ENUMS.get(name)
+    return None if key is None else ENUMS[key]
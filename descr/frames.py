@@ -0,0 +1,153 @@
+from layout import TABLES
+from .enums import *
+from .widgets import DCheckbutton, DClick, DCombobox, DEntry, DLabel, DSeparator, DTabFrame
+
+def make_descr_invenventory(table):
+    frame_content = [[DLabel(label) for label in ('', 'Item', 'Qty', '', 'Max', '', 'Dmg', 'Rld', 'Cap','Crt', 'Prc', 'Rng','Zom', 'I', 'R')]]
+    for i in range(table.count):
+        offset = lambda column: table.field_offset(i, column)
+        row = [
+            DLabel(f'{i+1}'),
+            DCombobox(offset('item'), 2, options=dict_weapons, width=25),
+            DEntry(offset('qty'), 4, width=5),
+            DLabel('/'),
+            DEntry(offset('max'), 4, width=5),
+            DLabel('', width=2)]
+        [row.append(DEntry(offset(column), 1, width=4)) for column in ('damage', 'reload', 'capacity', 'critical', 'piercing', 'range', 'zoom')]
+        row.append(DClick(offset('capacity'), 1, val_on=127, val_off=0, bind=row[8]))
+        row.append(DClick(offset('extra'), 1, val_on=102, val_off=0))
+        frame_content.append(row)
+    return frame_content
+
+def make_descr_treasures(column_size, table=TABLES['treasure']):
+    frame_content = list()
+    for i in range(column_size):
+        frame_content.append(list())
+    for i in range(table.count):
+        row_no = i % column_size
+        frame_content[row_no].append(DLabel(str(i+1), width=2))
+        frame_content[row_no].append(DCombobox(table.field_offset(i, 'item'), 2, options=dict_treasure, width=25))
+        frame_content[row_no].append(DEntry(table.field_offset(i, 'qty'), 1, width=3))
+        frame_content[row_no].append(DLabel('', width=2))
+    labels = list()
+    for i in range(table.count // column_size):
+        for item in (None, DLabel('Item'), DLabel('Qty'), None):
+            labels.append(item)
+    frame_content.insert(0, labels)
+    return frame_content
+
+def make_descr_checkarray(offset, labels_list, rows):
+    checkarray = list()
+    row_no = 0
+    no = 0
+    for item in labels_list:
+        if len(checkarray) <= row_no:
+            checkarray.append(list())
+        if item == '#separator':
+            checkarray[row_no].append(DSeparator())
+        else:
+            checkarray[row_no].append(DCheckbutton(offset, no, item))
+            no += 1
+        row_no += 1
+        if row_no >= rows:
+            row_no = 0
+    return checkarray
+
+def make_descr_levels():
+    labels = ('', '1–1', '1–2', '2–1', '2–2', '2–3', '3–1', '3–2', '3–3', '4–1', '4–2', '5–1', '5–2', '5–3', '6–1', '6–2', '6–3')
+    frame_content = [
+        [DLabel(label) for label in labels],
+        [DLabel('Amateur')],
+        [DLabel('Normal')],
+        [DLabel('Veteran')],
+        [DLabel('Professional')]]
+    for i in range(16):
+        for j in range(1,5):
+            frame_content[j].append(DCheckbutton(0x1bc + (0x4 * (j-1)), i))
+    return frame_content
+
+tabs = {
+    'Progression': [
+        [DTabFrame('Last save', uniform=False),  DTabFrame('General', uniform=False),            DTabFrame('Current', uniform=False),  DTabFrame('Characters', uniform=False)],
+        [DTabFrame('Warning'),                   DTabFrame('Levels', colspan=2, uniform=False),  None,                                 DTabFrame('Versus', uniform=False)]
+    ],
+    'Inventory': [
+        [DTabFrame('Chris', uniform=False),      DTabFrame('Sheva', uniform=False)]
+    ],
+    'Treasure': [
+        [DTabFrame('Treasure', uniform=False)]
+    ],
+    'Special': [
+        [DTabFrame('Special Settings', colspan=2, uniform=False),   None, DTabFrame('Filters'),  DTabFrame('Infinite Ammo', rowspan=2),  DTabFrame('Versus Characters', rowspan=2)],
+        [DTabFrame('Chris Outfits'),                                DTabFrame('Sheva Outfits')]
+    ],
+    'Unlocks': [
+        [DTabFrame('Shop'),     DTabFrame('Bonus Features')]
+    ],
+    'Library': [
+        [DTabFrame('Files'),    DTabFrame('Figures')]
+    ],
+    'Library cont.': [
+        [DTabFrame('Cutscenes')]
+    ]
+}
+
+frames = {
+    'Warning':[
+        [DLabel('')],
+        [DLabel('This code is designed to work exclusively \nwith save files from the Steam release of \nResident Evil 5 Gold Edition (version 1.2.0).')],
+        [DLabel('')],
+        [DLabel('Always make backups!')]
+    ],
+    'Last save': [
+        [DLabel('')],
+        [DLabel('YYYY-MM-DD'),  DEntry(0x10, 4, max=2099, width=4),  DLabel('-'),  DEntry(0x14, 4, max=12, width=4),  DLabel('-'),  DEntry(0x18, 4, max=12, width=4)],
+        [DLabel('HH:MM:SS'),    DEntry(0x1c, 4, max=23, width=4),    DLabel(':'),  DEntry(0x20, 4, max=59, width=4),  DLabel(':'),  DEntry(0x24, 4, max=59, width=4)],
+    ],
+    'Versus': [
+        [None,                      DLabel('Played'),            DLabel('Won')],
+        [DLabel('Slayers'),         DEntry(0x0C98, 4, width=5),  DEntry(0x0C9C, 4, width=5),   DLabel('Melee kills'), DEntry(0x182, 2, width=5)],
+        [DLabel('Survivors'),       DEntry(0x12D8, 4, width=5),  DEntry(0x12DC, 4, width=5)],
+        [DLabel('Team Slayers'),    DEntry(0x1990, 4, width=5),  DEntry(0x1994, 4, width=5)],
+        [DLabel('Team Survivors'),  DEntry(0x1FD0, 4, width=5),  DEntry(0x1FD4, 4, width=5)],
+    ],
+    'General': [
+        [DLabel('SteamID'),          DEntry(0x0, 4)],
+        [DLabel('Playtime, sec'),    DEntry(0x18c, 4)],
+        [DLabel('Money'),            DEntry(0x194, 4, max=9999999)],
+        [DLabel('Exchange Points'),  DEntry(0x198, 4, max=9999999)],
+    ],
+    'Characters': [
+        [None,             DLabel('HP'),                None,         DLabel('Max'), None, DLabel('Exists')],
+        [DLabel('Chris'),  DEntry(0x3C50, 4, width=5),  DLabel('/'),  DEntry(0x3c54, 4, width=5), DLabel('', width=2), DCheckbutton(0x3C40)],
+        [DLabel('Sheva'),  DEntry(0x3CA0, 4, width=5),  DLabel('/'),  DEntry(0x3CA4, 4, width=5), DLabel('', width=2), DCheckbutton(0x3C90)],
+    ],
+    'Current': [
+        [DLabel('State'),            DCombobox(0x3bb0, 4, dict_state, width=30)],
+        [DLabel('Character'),        DCombobox(0x3bb4, 1, dict_character, width=30)],
+        [DLabel('Difficulty'),       DCombobox(0x3bb8, 4, dict_difficulty, width=30)],
+        [DLabel('Area'),             DCombobox([0x3bc0, 0x3bc8], 4, dict_area, width=30)],
+        #[DLabel('Co-op settings'),   DCombobox(0x60, 4, {'No Limits': 0, 'Invite Only': 1, 'Rogue': 2})],
+        #[DLabel('Attack reaction'),  DCheckbutton(0x64, text='Enabled')],        
+    ],
+    'Special Settings': [
+        [DLabel('Chris costume'),       DCombobox([0x50, 0x5d44], 4, dict_chriscostume)],
+        [DLabel('Sheva costume'),       DCombobox([0x54, 0x5d48], 4, dict_shevacostume)],
+        [DLabel('Filter'),              DCombobox(0x58, 4, dict_filter)],
+        [DLabel('Infinite Ammo Mode'),  DCheckbutton(0x5C, 0)],
+    ],
+    'Chris Outfits':     make_descr_checkarray(0x124, ['BSAA', 'Safari', 'S.T.A.R.S.', 'Warrior', 'Heavy Metal'], 12),
+    'Sheva Outfits':     make_descr_checkarray(0x128, ['BSAA', 'Clubbin\'', 'Tribal', 'Business', 'Fairy Tale'], 12),
+    'Filters':           make_descr_checkarray(0x12c, ['Default', 'Classic Horror', 'Retro', 'Noise'], 12),
+    'Infinite Ammo':     make_descr_checkarray(0x130, list_infammo, 11),
+    'Files':             make_descr_checkarray(0x134, list_files, 12),
+    'Figures':           make_descr_checkarray(0x138, list_figures, 12),
+    'Cutscenes':         make_descr_checkarray(0x140, list_cutscenes, 12),
+    'Shop':              make_descr_checkarray(0x148, list_shop, 12),
+    'Bonus Features':    make_descr_checkarray(0x158, list_bonus, 12),
+    'Versus Characters': make_descr_checkarray(0x180, list_characters, 11),
+    'Levels':            make_descr_levels(),
+    'Treasure':          make_descr_treasures(10),
+    'Chris':             make_descr_invenventory(TABLES['inventory.chris']),
+    'Sheva':             make_descr_invenventory(TABLES['inventory.sheva'])
+}
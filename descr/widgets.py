@@ -0,0 +1,274 @@
+from dataclasses import dataclass, field
+from layout import LAYOUT
+from .enums import enum_of
+
+# tkinter is only imported by create(), so the descriptions load without a display
+
+dirty = dict() # Cells edited since they were last read or written, by id
+
+@dataclass
+class D: # Ensure all D-classes has those two
+    def read_value(self, record):
+        pass
+
+    def write_value(self, record):
+        pass
+
+    def mark_dirty(self, *args):
+        dirty[id(self)] = self
+
+@dataclass
+class DSeparator(D):
+    widget: None = None
+
+    def create(self, parent, **kwargs):
+        from tkinter import ttk
+        self.widget = ttk.Separator(
+            parent,
+            orient='horizontal',
+            #style="TLabel",
+            **kwargs
+        )
+
+@dataclass
+class DLabel(D):
+    text: str
+    width: int = None
+    widget: None = None
+
+    def create(self, parent, **kwargs):
+        from tkinter import ttk
+        self.widget = ttk.Label(
+            parent,
+            text=self.text,
+            style="TLabel",
+            width=self.width,
+            **kwargs
+        )
+
+@dataclass
+class DCheckbutton(D):
+    offset: int
+    bit_index: int = 0
+    text: str = ''
+    var: None = None
+    widget: None = None
+    name: str = None
+
+    def __post_init__(self):
+        self.name = LAYOUT.lookup(self.offset, bit=self.bit_index).name
+
+    def create(self, parent, **kwargs):
+        import tkinter as tk
+        from tkinter import ttk
+        self.var = tk.BooleanVar()
+        self.var.trace_add("write", self.mark_dirty)
+        self.widget = ttk.Checkbutton(
+            parent,
+            variable=self.var,
+            text=self.text,
+            style="TCheckbutton",
+            **kwargs
+        )
+    
+    def read_value(self, record):
+        value = record[self.name]
+        self.var.set(value)
+
+    def write_value(self, record):
+        record[self.name] = int(self.var.get())
+
+@dataclass
+class DEntry(D):
+    offset: int
+    size: int = 1
+    min: int = 0
+    max: int = None
+    width: int = 20
+    var: None = None
+    widget: None = None
+    name: str = None
+
+    def __post_init__(self):
+        if type(self.max) is not(int):
+            self.max = 2 ** (self.size*8) - 1
+        self.name = LAYOUT.lookup(self.offset, self.size).name
+
+    def create(self, parent, **kwargs):
+        import tkinter as tk
+        from tkinter import ttk
+        self.var = tk.IntVar()
+        self.var.trace_add("write", self.mark_dirty)
+        self.widget = ttk.Entry(
+            parent,
+            textvariable=self.var,
+            style="TEntry",
+            validate="key",
+            width=self.width,
+            **kwargs
+        )
+        validate_command = (self.widget.register(self.validate), '%P')
+        self.widget.configure(validatecommand=validate_command)
+    
+    def validate(self, value):
+        if value.isdigit():
+            iv = int(value)
+            if iv < self.min or iv > self.max:
+                return False
+            return True
+        return False
+    
+    def read_value(self, record):
+        value = record[self.name]
+        self.var.set(value)
+
+    def write_value(self, record):
+        record[self.name] = int(self.var.get())
+
+@dataclass
+class DCombobox(D):
+    offset: int
+    size: int = 1
+    options: dict = field(default_factory=lambda: {'Default option 1': 0, 'Default option 2': 1})
+    width: int = 20
+    var: None = None
+    widget: None = None
+    name: str = None
+    enum: None = None
+
+    def __post_init__(self):
+        self.name = LAYOUT.lookup(self.offset, self.size).name
+        self.enum = enum_of(self.options)
+
+    def create(self, parent, **kwargs):
+        import tkinter as tk
+        from tkinter import ttk
+        self.var = tk.StringVar()
+        self.var.trace_add("write", self.mark_dirty)
+        self.widget = ttk.Combobox(
+            parent,
+            values=self.enum.labels,
+            style="TCombobox",
+            width=self.width,
+            **kwargs
+        )
+        self.widget.bind("<<ComboboxSelected>>", self.select)
+    
+    def select(self, event):
+        self.var.set(self.enum.value(event.widget.get()))
+
+    def read_value(self, record):
+        value = record[self.name]
+        position = self.enum.position(value)
+        
+        if position is not None:
+            self.widget.current(position)
+        else:
+            self.widget.set(self.enum.label(value))
+            
+        self.widget.configure(state="readonly")
+        self.var.set(value)
+
+    def write_value(self, record):
+        record[self.name] = int(self.var.get())
+
+@dataclass
+class DTabFrame(D):
+    label: str
+    content: list = field(default_factory=lambda: list())
+    rowspan: int = 1
+    colspan: int = 1
+    uniform: bool = True
+    widget: None = None
+
+    def create(self, parent, frame_row, frame_col):
+        from .frames import frames
+        from tkinter import ttk
+        self.content = frames.get(self.label)
+
+        if self.content is None:
+            raise ValueError(f'Frame "{self.label}" does not exist in "frames"')
+        
+        self.widget = ttk.LabelFrame(parent, text=self.label) # style='TFrame'
+        self.widget.grid(row=frame_row, column=frame_col, rowspan=self.rowspan, columnspan=self.colspan, sticky='nesw', padx=5, pady=10)
+        f_row_index = 0
+
+        for f_row in self.content:
+            f_col_index = 0
+
+            for f_cell in f_row:
+
+                if type(f_cell) in (DCheckbutton, DCombobox, DEntry, DLabel, DClick):
+                    f_cell.create(self.widget, state="disabled")
+                    if type(f_cell) is DLabel:
+                        f_cell.widget.grid(row=f_row_index, column=f_col_index, padx=5, pady=2, sticky='w')
+                    else:
+                        f_cell.widget.grid(row=f_row_index, column=f_col_index, padx=2, pady=2, sticky='w')
+                elif type(f_cell) is DSeparator:
+                    f_cell.create(self.widget)
+                    f_cell.widget.grid(row=f_row_index, column=f_col_index, padx=23, pady=0, sticky='ew')
+                
+                if self.uniform:
+                    self.widget.grid_columnconfigure(f_col_index, weight=1, uniform=f"Grid {self.label}")
+
+                f_col_index += 1
+
+            #self.widget.grid_rowconfigure(f_row_index, weight=1, uniform=f"{self.label}")
+            f_row_index += 1
+
+@dataclass
+class DClick(D):
+    offset: int
+    size: int = 1
+    val_on: int = 1
+    val_off: int = 0
+    text: str = ''
+    bind: None = None
+    var: None = None
+    widget: None = None
+    name: str = None
+
+    def __post_init__(self):
+        self.name = LAYOUT.lookup(self.offset, self.size).name
+
+    def create(self, parent, **kwargs):
+        import tkinter as tk
+        from tkinter import ttk
+        self.var = tk.BooleanVar()
+        self.var.trace_add("write", self.mark_dirty)
+        self.widget = ttk.Checkbutton(
+            parent,
+            variable=self.var,
+            text=self.text,
+            command=self.click,
+            style="TCheckbutton",
+            **kwargs
+        )
+
+    def read_value(self, record):
+        import tkinter as tk
+        if self.bind is None:
+            self.bind = DEntry(self.offset, self.size)
+            self.bind.var = tk.IntVar()
+        value = record[self.name]
+        self.bind.var.set(value)
+        if value == self.val_on: 
+            self.var.set(True)
+            if self.bind.var is not None and self.bind.widget is not None:
+                self.bind.widget.configure(state="disabled")
+        else:
+            self.var.set(False)
+
+    def write_value(self, record):
+        record[self.name] = int(self.bind.var.get())
+
+    def click(self):
+        value = bool(self.var.get())
+        if value:
+            self.bind.var.set(self.val_on)
+            if self.bind.widget is not None:
+                self.bind.widget.configure(state="disabled")
+        else:
+            self.bind.var.set(self.val_off)
+            if self.bind.widget is not None:
+                self.bind.widget.configure(state="enabled")
@@ -1,36 +1,326 @@
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CHECKSUM_OFFSET = 0x8
+CHECKSUM_REGIONS = ((0x10, 0xee7), (0x3bb0, 0x5c0)) # (offset, number of 32-bit words)
+SIZE_MIN, SIZE_MAX = 23800, 24000
+SIGNATURE_OFFSET = 0x3be8
+SIGNATURE_COPIES = (0x3c00, 0x3c18, 0x3c30)
+SMALL = 256 # Bytes below which the int codec beats numpy's setup cost
+
+
+def _decode_numpy(data, key):
+    n = len(data)
+    cipher = np.frombuffer(bytes(data) + bytes(-n % 8), '<u8')
+    keys = np.empty_like(cipher)
+    keys[0] = int.from_bytes(key, 'little')
+    keys[1:] = cipher[:-1]
+    return (cipher ^ keys).tobytes()[:n]
+
+def _encode_numpy(data, key):
+    n = len(data)
+    plain = np.frombuffer(bytes(data) + bytes(-n % 8), '<u8').copy()
+    plain[0] ^= np.uint64(int.from_bytes(key, 'little'))
+    return np.bitwise_xor.accumulate(plain).tobytes()[:n]
+
+def _decode_int(data, key):
+    # Chunk k of the plaintext is cipher[k] ^ cipher[k-1], so shifting the
+    # whole file left by one chunk gives every key at once
+    n = len(data)
+    mask = (1 << (n * 8)) - 1
+    cipher = int.from_bytes(data, 'little')
+    keys = ((cipher << 64) | int.from_bytes(key, 'little')) & mask
+    return (cipher ^ keys).to_bytes(n, 'little')
+
+def _encode_int(data, key):
+    # Encoding is a prefix XOR over chunks, done in log2(chunks) doubling steps
+    n = len(data)
+    mask = (1 << (n * 8)) - 1
+    value = int.from_bytes(data, 'little') ^ int.from_bytes(key, 'little')
+    shift = 64
+    while shift < n * 8:
+        value = (value ^ (value << shift)) & mask
+        shift <<= 1
+    return (value & mask).to_bytes(n, 'little')
+
+def decode(data, key):
+    if not data:
+        return bytes()
+    if np is not None and len(data) > SMALL:
+        return _decode_numpy(data, key)
+    return _decode_int(data, key)
+
+def encode(data, key):
+    if not data:
+        return bytes()
+    if np is not None and len(data) > SMALL:
+        return _encode_numpy(data, key)
+    return _encode_int(data, key)
+
+def decode_range(cipher, offset, length, key):
+    # Plaintext chunk k only depends on cipher chunks k and k-1
+    first = offset // 8 * 8
+    end = min(len(cipher), (offset + length + 7) // 8 * 8)
+    if first >= end:
+        return bytes()
+    if first:
+        key = cipher[ first-8 : first ]
+    plain = decode(cipher[ first : end ], key)
+    return plain[ offset-first : offset-first+length ]
+
+def sum_words(data, start, end):
+    # Sum of little-endian 32-bit words in data[start:end], missing bytes read as zero
+    qty = (end - start) // 4
+    if qty <= 0:
+        return 0
+    if len(data) < end:
+        data = bytes(data[ start : end ]).ljust(end - start, b'\0')
+        start = 0
+    if np is not None and qty * 4 > SMALL:
+        return int(np.frombuffer(data, '<u4', qty, start).sum(dtype=np.uint64))
+    return sum(struct.unpack_from(f'<{qty}I', data, start))
+
+def checksum(data):
+    ret = 0
+    for offset, qty in CHECKSUM_REGIONS:
+        ret += sum_words(data, offset, offset + qty*4)
+    return ret % 2**32
+
+def checksum_span(data, start, end, base=0):
+    # Sum of every checksummed word that overlaps [start, end) of the save;
+    # data holds the save from offset base on
+    ret = 0
+    for offset, qty in CHECKSUM_REGIONS:
+        lo = max(start, offset)
+        hi = min(end, offset + qty*4)
+        if lo < hi:
+            lo = offset + (lo - offset) // 4 * 4
+            hi = offset + (hi - offset + 3) // 4 * 4
+            ret += sum_words(data, lo - base, hi - base)
+    return ret
+
+def xor_chunks(buffer, start, end, delta):
+    # buffer[start:end] ^= delta, a 64-bit little-endian pattern repeated every 8 bytes
+    if not delta or start >= end:
+        return
+    count = (end - start) // 8
+    if np is not None and count:
+        view = np.frombuffer(buffer, '<u8', count, start)
+        view ^= np.uint64(delta)
+        del view
+        start += count * 8
+    if start < end:
+        n = end - start
+        pattern = delta.to_bytes(8, 'little') * (n // 8 + 1)
+        value = int.from_bytes(buffer[ start : end ], 'little') ^ int.from_bytes(pattern[:n], 'little')
+        buffer[ start : end ] = value.to_bytes(n, 'little')
+
+def file_mode(filename):
+    # Permissions of an existing file, or what open() would give a new one
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_atomic(filename, data):
+    # Write next to the target and rename over it, so readers never see a partial file.
+    # The file keeps its permissions and is on disk before the rename.
+    directory = os.path.dirname(os.path.abspath(filename))
+    mode = file_mode(filename)
+    fd, tmppath = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.bin')
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tmppath, mode)
+        os.replace(tmppath, filename)
+    except BaseException:
+        os.unlink(tmppath)
+        raise
+
+
 class RE5SaveData:
+    # Edits are not thread-safe to read from other threads; those take a snapshot(),
+    # which shares the buffer. While one is alive, the next write copies the buffer first.
+    journal_limit = 1000 # Undo steps kept, older ones are folded into self.trimmed
+
     def __init__(self):
         self.magic = bytes([0x00, 0x21, 0x11, 0x08, 0xC0, 0x4B, 0x00, 0x00])
+        self.lock = threading.RLock() # Held by writers for a whole edit or transaction
+        self._view_lock = threading.Lock() # Held for one write, and by snapshot() to publish
+        self._depth = 0 # Nesting of transaction()
+        self._writes = None # (offset, old bytes, written length) of each write in the transaction
+        self._saved = None # _save_state() from the start of the transaction
         self.data = None
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        if value is not None and type(value) is not bytearray:
+            value = bytearray(value)
+        self._data = value
+        self.checksum = None # Running checksum, recomputed lazily after a reload
+        self.journal = [] # Undo steps, each a list of (offset, old bytes, new bytes)
+        self.journal_pos = 0 # Steps before this index are applied, the rest can be redone
+        self.trimmed = {} # Loaded value of bytes changed by steps that fell off the journal
+        self._step = None # Edits collected by set_many
+        self._view = None # Snapshot of the committed data, made on demand
+        self._shared = None # Weak reference to the snapshot sharing self._data
+
     def xor(self, data, key):
         return bytes([i^j for i,j in zip(data, key)])
     
-    def open_file(self, filename):
-        with open(filename, "rb") as file:
-            key = self.magic
-            self.data = bytes()
-            while (chunk := file.read(8)):
-                self.data += self.xor(chunk, key)
-                key = chunk
+    def open_file(self, source):
+        # source: path, encoded bytes or a binary file object
+        if hasattr(source, 'read'):
+            raw = source.read()
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            raw = source
+        else:
+            with open(source, "rb") as file:
+                raw = file.read()
+        self.data = bytearray(decode(raw, self.magic))
+        self.checksum = self.calculate_checksum()
 
-    def save_file(self, filename):
+    def to_bytes(self):
+        # Encoded save, as save_file would write it
         self.update_checksum()
-        with open(filename, "wb") as file:
-            key = self.magic
-            i = 0
-            while i <= len(self.data):
-                chunk = self.data[  i : i+8 ] 
-                encoded_data = self.xor(chunk, key)
-                file.write(encoded_data)
-                key = encoded_data
-                i += 8
+        return encode(self.data, self.magic)
+
+    def save_file(self, target):
+        # target: path, written atomically, or a binary file object
+        data = self.to_bytes()
+        if hasattr(target, 'write'):
+            target.write(data)
+        else:
+            write_atomic(target, data)
+
+    def check_signature(self):
+        value = self.get_value(SIGNATURE_OFFSET, 8)
+        for offset in SIGNATURE_COPIES:
+            if value != self.get_value(offset, 8):
+                return False
+        return True
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def get_bytes(self, offset, length):
-        return self.data[ offset : offset+length ]
+        return bytes(self._data[ offset : offset+length ])
 
     def set_bytes(self, bytes_piece, offset, length):
-        self.data = self.data[ : offset ] + bytes_piece + self.data[ offset + length : ]
+        with self.lock:
+            old = bytes(self._data[ offset : offset+length ])
+            self._write(bytes_piece, offset, length)
+            if old != bytes_piece:
+                self._record(offset, old, bytes(bytes_piece))
+
+    def _write(self, bytes_piece, offset, length):
+        with self.lock, self._view_lock:
+            if not self._depth:
+                self._view = None
+            self._unshare()
+            end = offset + length
+            if self._writes is not None:
+                self._writes.append((offset, bytes(self._data[ offset : end ]), len(bytes_piece)))
+            if self.checksum is None or len(bytes_piece) != length:
+                self._data[ offset : end ] = bytes_piece
+                self.checksum = None
+                return
+            old = checksum_span(self._data, offset, end)
+            self._data[ offset : end ] = bytes_piece
+            self.checksum = (self.checksum - old + checksum_span(self._data, offset, end)) % 2**32
+
+    def _unshare(self):
+        # Copies the buffer if a snapshot still holds it
+        if self._shared is not None:
+            if self._shared() is not None:
+                self._data = bytearray(self._data)
+            self._shared = None
+
+    def snapshot(self):
+        # Read-only RE5SaveSnapshot of the last committed state. Safe to hand to other
+        # threads; it never changes and taking one does not copy the data. It does not
+        # wait for a running transaction, only for the write in progress.
+        view = self._view
+        if view is None:
+            with self._view_lock:
+                if self._view is None:
+                    if self._writes:
+                        # A transaction has written: undo its writes on a copy
+                        data = bytearray(self._data)
+                        for offset, old, length in reversed(self._writes):
+                            data[ offset : offset+length ] = old
+                        self._view = RE5SaveSnapshot(data, self._saved[0], self.magic)
+                    else:
+                        self._view = RE5SaveSnapshot(self._data, self.checksum, self.magic)
+                        self._shared = weakref.ref(self._view)
+                view = self._view
+        return view
+
+    def _save_state(self):
+        # What transaction() puts back on an exception besides the written bytes. Loaded
+        # values are only ever added to self.trimmed, so its length is enough.
+        return self.checksum, list(self.journal), self.journal_pos, self.trimmed, len(self.trimmed)
+
+    def _restore_state(self, state):
+        self.checksum, self.journal, self.journal_pos, self.trimmed, count = state
+        while len(self.trimmed) > count:
+            self.trimmed.popitem()
+
+    @contextmanager
+    def transaction(self):
+        # Edits inside reach snapshot() together when the outermost block exits. On an
+        # exception the writes are undone and the checksum and journal restored.
+        with self.lock:
+            outer = not self._depth
+            if outer:
+                with self._view_lock:
+                    self._saved = self._save_state()
+                    self._writes = []
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                if outer:
+                    with self._view_lock:
+                        self._unshare()
+                        for offset, old, length in reversed(self._writes):
+                            self._data[ offset : offset+length ] = old
+                        self._restore_state(self._saved)
+                        self._writes = self._saved = None
+                raise
+            finally:
+                self._depth -= 1
+                if outer and self._writes is not None:
+                    with self._view_lock:
+                        if self._writes:
+                            self._view = None
+                        self._writes = self._saved = None
 
     def get_value(self, offset, length):
         return int.from_bytes( self.get_bytes(offset, length) , 'little' )
@@ -39,38 +329,327 @@ class RE5SaveData:
         bytes_piece = int.to_bytes(value, length, 'little')
         self.set_bytes(bytes_piece, offset, length)
 
+    def set_many(self, items):
+        # items: iterable of (value, offset, length), value is an int or bytes.
+        # The whole batch is one undo step and one transaction.
+        with self.transaction():
+            outer = self._step is None
+            if outer:
+                self._step = []
+            try:
+                for value, offset, length in items:
+                    if type(value) is int:
+                        value = int.to_bytes(value, length, 'little')
+                    self.set_bytes(value, offset, length)
+            finally:
+                if outer:
+                    step, self._step = self._step, None
+                    if step:
+                        self._push(step)
+
+    def _record(self, offset, old, new):
+        if self._step is not None:
+            self._step.append((offset, old, new))
+        else:
+            self._push([(offset, old, new)])
+
+    def _push(self, step):
+        del self.journal[ self.journal_pos : ]
+        if self.journal and len(step) == 1 and len(self.journal[-1]) == 1:
+            # Consecutive edits of the same field collapse into one step. The bits of a
+            # flag byte are separate fields, so single bytes only merge if the same bits flip.
+            offset, old, new = self.journal[-1][0]
+            if offset == step[0][0] and len(new) == len(step[0][1]) and (len(new) > 1 or old[0] ^ new[0] == step[0][1][0] ^ step[0][2][0]):
+                new = step[0][2]
+                if new == old:
+                    self.journal.pop()
+                else:
+                    self.journal[-1] = [(offset, old, new)]
+                self.journal_pos = len(self.journal)
+                return
+        self.journal.append(step)
+        if len(self.journal) > self.journal_limit:
+            for offset, old, new in self.journal.pop(0):
+                for i, value in enumerate(old):
+                    self.trimmed.setdefault(offset + i, value)
+        self.journal_pos = len(self.journal)
+
+    def can_undo(self):
+        return self.journal_pos > 0
+
+    def can_redo(self):
+        return self.journal_pos < len(self.journal)
+
+    def undo(self):
+        if not self.can_undo():
+            return False
+        with self.transaction():
+            self.journal_pos -= 1
+            for offset, old, new in reversed(self.journal[self.journal_pos]):
+                self._write(old, offset, len(new))
+        return True
+
+    def redo(self):
+        if not self.can_redo():
+            return False
+        with self.transaction():
+            for offset, old, new in self.journal[self.journal_pos]:
+                self._write(new, offset, len(old))
+            self.journal_pos += 1
+        return True
+
+    def revert(self):
+        # Back to the data as loaded; clears the journal
+        with self.transaction():
+            while self.undo():
+                pass
+            for offset, value in self.trimmed.items():
+                self._write(bytes((value,)), offset, 1)
+            self.journal.clear()
+            self.trimmed = {}
+
     def get_bit(self, offset, bit_index):
         extra_offset = bit_index  // 8
         chunk = self.get_value(offset + extra_offset, 1)
         return chunk >> (bit_index - (extra_offset * 8)) & 1
     
     def set_bit(self, offset, bit_index, bit):
-        extra_offset = bit_index  // 8
-        chunk = self.get_value(offset + extra_offset, 1)
-        prev_chunk = chunk
-        mask = 1 << (bit_index - (extra_offset * 8))
-        chunk |= mask
-        chunk ^= (not bit) * mask
-        self.set_value(chunk, offset + extra_offset, 1)
+        with self.lock:
+            extra_offset = bit_index  // 8
+            chunk = self.get_value(offset + extra_offset, 1)
+            prev_chunk = chunk
+            mask = 1 << (bit_index - (extra_offset * 8))
+            chunk |= mask
+            chunk ^= (not bit) * mask
+            self.set_value(chunk, offset + extra_offset, 1)
+
+    # Flag blocks: bit i lives in byte offset + i//8, like get_bit/set_bit. Writes hold
+    # self.lock from the read to the write, so concurrent writers do not lose bits.
+
+    def get_bits(self, offset, count):
+        if count <= 0:
+            return []
+        value = self.get_value(offset, (count + 7) // 8) & ((1 << count) - 1)
+        return [digit == '1' for digit in format(value, f'0{count}b')[::-1]]
+
+    def set_bits(self, offset, bits):
+        bits = list(bits)
+        count = len(bits)
+        value = int(''.join('1' if bit else '0' for bit in reversed(bits)) or '0', 2)
+        self.apply_mask(offset, (count + 7) // 8, ~((1 << count) - 1), value)
+
+    def set_all(self, offset, count):
+        self.apply_mask(offset, (count + 7) // 8, -1, (1 << count) - 1)
+
+    def clear_all(self, offset, count):
+        self.apply_mask(offset, (count + 7) // 8, ~((1 << count) - 1), 0)
+
+    def apply_mask(self, offset, length, and_mask=-1, or_mask=0):
+        # New block is (block & and_mask) | or_mask, written only if it changed
+        with self.lock:
+            block = self.get_value(offset, length)
+            value = (block & and_mask | or_mask) & ((1 << (length * 8)) - 1)
+            if value != block:
+                self.set_value(value, offset, length)
+            return value
 
     def calculate_checksum(self):
-        def chksum(offset, qty, ret):
-            for i in range(offset, offset+qty*4, 4):
-                val = self.get_value(i, 4)
-                ret = (ret+val)%2**32
-            return ret
-        offset1, offset2 = 0x10, 0x3bb0
-        qty1, qty2 = 0xee7, 0x5c0
-        return chksum(offset2, qty2, chksum(offset1, qty1, 0))
+        return checksum(self._data)
+
+    def verify_checksum(self):
+        return self.get_value(CHECKSUM_OFFSET, 4) == self.calculate_checksum()
     
     def update_checksum(self):
-        self.set_value(
-            self.calculate_checksum(),
-            0x8,
+        if self.checksum is None:
+            self.checksum = self.calculate_checksum()
+        self._write(
+            int.to_bytes(self.checksum, 4, 'little'),
+            CHECKSUM_OFFSET,
             4
         )
 
 
+class RE5SaveSnapshot(RE5SaveData):
+    # Frozen state returned by RE5SaveData.snapshot(). It shares the editor's buffer,
+    # which the editor copies instead of changing once a snapshot holds it.
+    def __init__(self, data, checksum, magic):
+        super().__init__()
+        self.magic = magic
+        self._data = data
+        self.checksum = checksum
+
+    def snapshot(self):
+        return self
+
+    def _write(self, bytes_piece, offset, length):
+        raise TypeError('RE5SaveSnapshot is read-only')
+
+    def to_bytes(self):
+        # Encoded with the checksum of the snapshot, the shared buffer is left alone
+        if self.checksum is None:
+            self.checksum = self.calculate_checksum()
+        data = bytearray(self._data)
+        data[ CHECKSUM_OFFSET : CHECKSUM_OFFSET+4 ] = int.to_bytes(self.checksum, 4, 'little')
+        return encode(data, self.magic)
+
+
+class RE5SaveView(RE5SaveData):
+    # Read-only, memory-mapped save that decodes only the chunks each read touches
+    def __init__(self, filename=None):
+        super().__init__()
+        self.cipher = None
+        if filename is not None:
+            self.open_file(filename)
+
+    def open_file(self, source):
+        # Paths are memory-mapped, encoded bytes are used as they are
+        self.close()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.cipher = source
+        elif hasattr(source, 'read'):
+            self.cipher = source.read()
+        else:
+            with open(source, "rb") as file:
+                self.cipher = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if isinstance(self.cipher, mmap.mmap):
+            self.cipher.close()
+        self.cipher = None
+
+    def __len__(self):
+        return len(self.cipher)
+
+    def save_file(self, filename):
+        raise TypeError('RE5SaveView is read-only')
+
+    def to_bytes(self):
+        raise TypeError('RE5SaveView is read-only')
+
+    def get_bytes(self, offset, length):
+        return decode_range(self.cipher, offset, length, self.magic)
+
+    def set_bytes(self, bytes_piece, offset, length):
+        raise TypeError('RE5SaveView is read-only')
+
+    def _write(self, bytes_piece, offset, length):
+        raise TypeError('RE5SaveView is read-only')
+
+    def update_checksum(self):
+        raise TypeError('RE5SaveView is read-only')
+
+    def calculate_checksum(self):
+        ret = 0
+        for offset, qty in CHECKSUM_REGIONS:
+            ret += sum_words(self.get_bytes(offset, qty*4), 0, qty*4)
+        return ret % 2**32
+
+
+class RE5SavePatch(RE5SaveView):
+    # Edits an encoded save in place. Cipher chunk j is the key XOR every plaintext chunk
+    # up to j, so changing plaintext chunk k by d flips every cipher chunk from k on by d.
+    # Edits are kept as per-chunk deltas; flush() adds the checksum fix-up and applies them
+    # all in one XOR pass over the file. The checksum is carried forward from the stored
+    # word, call update_checksum() to recompute it instead. There is no undo journal.
+    def __init__(self, filename=None):
+        self.pending = {} # Plaintext chunk index: XOR delta not yet applied to the cipher
+        super().__init__(filename)
+
+    def open_file(self, source):
+        # Paths are mapped read-write and patched in place, bytes and file objects are copied
+        self.close()
+        if hasattr(source, 'read'):
+            self.cipher = bytearray(source.read())
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.cipher = bytearray(source)
+        else:
+            with open(source, "r+b") as file:
+                self.cipher = mmap.mmap(file.fileno(), 0)
+        self.pending = {}
+        self.checksum = self.get_value(CHECKSUM_OFFSET, 4)
+
+    def close(self):
+        # Pending edits are written out first
+        if self.cipher is not None:
+            self.flush()
+        super().close()
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is not None:
+            # Nothing reaches the file unless the whole block ran
+            self.pending.clear()
+            self.checksum = None
+        self.close()
+
+    def to_bytes(self):
+        self.flush()
+        return bytes(self.cipher)
+
+    save_file = RE5SaveData.save_file
+
+    def get_bytes(self, offset, length):
+        plain = decode_range(self.cipher, offset, length, self.magic)
+        first = offset // 8
+        last = (offset + length + 7) // 8
+        deltas = [(chunk, delta) for chunk, delta in self.pending.items() if first <= chunk < last]
+        if not deltas:
+            return plain
+        plain = bytearray(plain)
+        for chunk, delta in deltas:
+            for i, byte in enumerate(delta.to_bytes(8, 'little')):
+                position = chunk*8 + i - offset
+                if byte and 0 <= position < len(plain):
+                    plain[position] ^= byte
+        return bytes(plain)
+
+    def set_bytes(self, bytes_piece, offset, length):
+        end = offset + length
+        if len(bytes_piece) != length or end > len(self.cipher):
+            raise ValueError('RE5SavePatch cannot change the size of the save')
+        first = offset // 8 * 8
+        last = min(len(self.cipher), (end + 7) // 8 * 8)
+        old = self.get_bytes(first, last - first)
+        new = bytearray(old)
+        new[ offset-first : end-first ] = bytes_piece
+        if old == new:
+            return
+        if self.checksum is not None:
+            self.checksum = (self.checksum - checksum_span(old, offset, end, first) + checksum_span(new, offset, end, first)) % 2**32
+        delta = int.from_bytes(old, 'little') ^ int.from_bytes(new, 'little')
+        for chunk in range(first // 8, (last + 7) // 8):
+            change = self.pending.get(chunk, 0) ^ (delta & 0xFFFFFFFFFFFFFFFF)
+            delta >>= 64
+            if change:
+                self.pending[chunk] = change
+            else:
+                self.pending.pop(chunk, None)
+
+    def _save_state(self):
+        # The running checksum and the deltas are the whole state, the cipher only
+        # changes in flush()
+        return self.checksum, dict(self.pending)
+
+    def _restore_state(self, state):
+        self.checksum, self.pending = state
+
+    def update_checksum(self):
+        # Recomputed from the decoded regions, written by the next flush()
+        self.checksum = self.calculate_checksum()
+
+    def flush(self):
+        if self.checksum is not None:
+            self.set_bytes(int.to_bytes(self.checksum, 4, 'little'), CHECKSUM_OFFSET, 4)
+        if not self.pending:
+            return
+        chunks = sorted(self.pending)
+        running = 0
+        for i, chunk in enumerate(chunks):
+            running ^= self.pending[chunk]
+            end = chunks[i + 1] * 8 if i + 1 < len(chunks) else len(self.cipher)
+            xor_chunks(self.cipher, chunk * 8, end, running)
+        self.pending.clear()
+
+
 if __name__ == '__main__':
     save = RE5SaveData()
     save.open_file('savedata.bin')
@@ -0,0 +1,213 @@
+import argparse
+import csv
+import fnmatch
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from time import perf_counter
+from editor import RE5SaveData, SIZE_MIN, SIZE_MAX, np
+from layout import LAYOUT
+from descr import field_enum
+from scan import walk
+
+# Exports the layout fields of many saves as columns, one row per file:
+#   csv    one line per save, flag bits as True/False
+#   jsonl  one JSON object per line
+#   npy    a directory with one .npy array per column and schema.json (needs numpy)
+#   npz    the same arrays and schema.json in one uncompressed .npz, np.load() opens it
+# Files are decoded one at a time and rows are written as they arrive, so memory does
+# not grow with the corpus. Every file gets a row; the "status" column holds its
+# scan.py class and the field columns are empty (or zero in arrays) unless it decoded.
+
+FORMATS = ('csv', 'jsonl', 'npy', 'npz')
+BLOCK_ROWS = 4096 # Rows buffered before they are copied into the .npy columns
+
+def select_fields(patterns=None):
+    # Layout fields whose name matches one of the patterns (exact names work too), all by default
+    if not patterns:
+        return list(LAYOUT)
+    return [field for field in LAYOUT if any(field.name == pattern or fnmatch.fnmatchcase(field.name, pattern) for pattern in patterns)]
+
+def field_dtype(field):
+    if field.bit is not None:
+        return 'bool'
+    bits = field.size * 8 * len(field.spans)
+    if bits not in (8, 16, 32, 64):
+        raise ValueError(f'Field "{field.name}" is {bits} bits wide, which has no array type')
+    return f'uint{bits}'
+
+def schema(fields, count):
+    enums = {}
+    columns = [{'name': 'path', 'dtype': 'str'}, {'name': 'status', 'dtype': 'str'}]
+    for field in fields:
+        enum = field_enum(field.name)
+        column = {'name': field.name, 'dtype': field_dtype(field), 'offset': field.offset, 'size': field.size}
+        if field.bit is not None:
+            column['bit'] = field.bit
+        if enum is not None:
+            column['enum'] = enum.name
+            enums[enum.name] = enum.options
+        columns.append(column)
+    return {'rows': count, 'columns': columns, 'enums': enums}
+
+def read_save(path, names):
+    # (path, status, values of the named fields); values is None unless the save decoded
+    try:
+        size = os.path.getsize(path)
+        if size < SIZE_MIN or size > SIZE_MAX:
+            return path, 'wrong-size', None
+        savedata = RE5SaveData()
+        savedata.open_file(path)
+    except (OSError, ValueError):
+        return path, 'unreadable', None
+    if not savedata.check_signature():
+        return path, 'wrong-signature', None
+    status = 'valid' if savedata.verify_checksum() else 'corrupt-checksum'
+    record = LAYOUT.read(savedata)
+    return path, status, [record[name] for name in names]
+
+def read_saves(files, fields, jobs=None):
+    # Yields read_save() results in file order
+    names = [field.name for field in fields]
+    if jobs == 1:
+        yield from map(read_save, files, repeat(names))
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(read_save, files, repeat(names), chunksize=max(1, min(64, len(files) // 64)))
+
+def text_converters(fields, labels):
+    converters = []
+    for field in fields:
+        enum = field_enum(field.name) if labels else None
+        if field.bit is not None:
+            converters.append(bool)
+        elif enum is not None:
+            converters.append(enum.label)
+        else:
+            converters.append(None)
+    return converters
+
+def text_rows(rows, fields, labels):
+    converters = text_converters(fields, labels)
+    for path, status, values in rows:
+        if values is not None:
+            values = [value if convert is None else convert(value) for convert, value in zip(converters, values)]
+        yield path, status, values
+
+def export_csv(file, rows, fields, labels=False):
+    writer = csv.writer(file)
+    writer.writerow(['path', 'status'] + [field.name for field in fields])
+    for path, status, values in text_rows(rows, fields, labels):
+        writer.writerow([path, status] + (values if values is not None else [''] * len(fields)))
+
+def export_jsonl(file, rows, fields, labels=False):
+    names = [field.name for field in fields]
+    for path, status, values in text_rows(rows, fields, labels):
+        record = {'path': path, 'status': status}
+        if values is not None:
+            record.update(zip(names, values))
+        file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def export_npy(directory, rows, fields, files):
+    # One preallocated .npy per column, filled a block of rows at a time
+    if np is None:
+        raise RuntimeError('The npy and npz formats need numpy')
+    os.makedirs(directory, exist_ok=True)
+    count = len(files)
+    dtypes = [('path', f'<U{max(map(len, files), default=1)}'), ('status', '<U16')]
+    dtypes += [(field.name, field_dtype(field)) for field in fields]
+    columns = [np.lib.format.open_memmap(os.path.join(directory, f'{name}.npy'), 'w+', dtype, (count,)) for name, dtype in dtypes]
+
+    def flush(start, block):
+        end = start + len(block)
+        columns[0][start:end] = [path for path, status, values in block]
+        columns[1][start:end] = [status for path, status, values in block]
+        empty = [0] * len(fields)
+        table = [values if values is not None else empty for path, status, values in block]
+        for i, values in enumerate(zip(*table)):
+            columns[i + 2][start:end] = values
+        return end
+
+    start = 0
+    block = []
+    for row in rows:
+        block.append(row)
+        if len(block) == BLOCK_ROWS:
+            start = flush(start, block)
+            block = []
+    if block:
+        flush(start, block)
+    for column in columns:
+        column.flush()
+    del columns
+
+    with open(os.path.join(directory, 'schema.json'), 'w', encoding='utf-8') as file:
+        json.dump(schema(fields, count), file, indent=1, ensure_ascii=False)
+
+def export_npz(target, rows, fields, files):
+    # The npy directory is built next to the target and zipped member by member
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(target))) as directory:
+        export_npy(directory, rows, fields, files)
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name in ['schema.json'] + [f'{name}.npy' for name in ('path', 'status')] + [f'{field.name}.npy' for field in fields]:
+                archive.write(os.path.join(directory, name), name)
+
+def output_format(target):
+    if target == '-':
+        return 'csv'
+    for suffix, fmt in (('.csv', 'csv'), ('.jsonl', 'jsonl'), ('.json', 'jsonl'), ('.npz', 'npz')):
+        if target.lower().endswith(suffix):
+            return fmt
+    return 'npy'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the fields of many RE5 saves as columns.')
+    parser.add_argument('paths', nargs='+', help='save files or directories to search')
+    parser.add_argument('-o', '--output', default='-', help='output file or npy directory, - for CSV on stdout (default: %(default)s)')
+    parser.add_argument('-f', '--format', choices=FORMATS, help='output format (default: from the output name, a directory is npy)')
+    parser.add_argument('--fields', nargs='+', metavar='PATTERN', help='only export these layout fields, e.g. "versus.*" "levels.*"')
+    parser.add_argument('--labels', action='store_true', help='write enum fields as their GUI label (csv and jsonl)')
+    parser.add_argument('-p', '--pattern', default='*.bin', help='file name pattern inside directories (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    fields = select_fields(args.fields)
+    if not fields:
+        parser.error('no layout field matches --fields')
+    fmt = args.format or output_format(args.output)
+    files = list(walk(args.paths, args.pattern))
+    counts = dict()
+
+    def counted(rows):
+        for row in rows:
+            counts[row[1]] = counts.get(row[1], 0) + 1
+            if row[1] not in ('valid', 'corrupt-checksum'):
+                print(f'{row[1]}\t{row[0]}', file=sys.stderr)
+            yield row
+
+    start = perf_counter()
+    rows = counted(read_saves(files, fields, args.jobs))
+    if fmt == 'npy':
+        export_npy(args.output, rows, fields, files)
+    elif fmt == 'npz':
+        export_npz(args.output, rows, fields, files)
+    else:
+        export = export_csv if fmt == 'csv' else export_jsonl
+        if args.output == '-':
+            export(sys.stdout, rows, fields, args.labels)
+        else:
+            with open(args.output, 'w', encoding='utf-8', newline='') as file:
+                export(file, rows, fields, args.labels)
+    elapsed = perf_counter() - start
+    rate = len(files) / elapsed if elapsed else 0.0
+    summary = ', '.join(f'{count} {status}' for status, count in counts.items())
+    print(f'{len(files)} files, {len(fields)} fields in {elapsed:.2f}s ({rate:.0f} files/s): {summary or "nothing found"}', file=sys.stderr)
+    return 0 if set(counts) <= {'valid', 'corrupt-checksum'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from time import perf_counter, time
+from editor import RE5SaveView
+from layout import LAYOUT
+from scan import classify, walk
+
+# Keeps summary fields of a save library in SQLite. Files whose mtime and size are
+# unchanged are skipped; files that were touched but hash the same are not re-read.
+#
+# Example: Professional 6–3 cleared (bit 15 of the level word)
+#   SELECT path FROM saves WHERE levels_professional & (1 << 15)
+
+SUMMARY = (
+    # (column, layout field)
+    ('steam_id', 'steam_id'),
+    ('playtime', 'playtime'),
+    ('money', 'money'),
+    ('difficulty', 'current.difficulty'),
+    ('area', 'current.area'), # Chapter in the low 32 bits, area id in the high 32 bits
+)
+LEVELS = (
+    # (column, offset of the 16-bit level bitfield)
+    ('levels_amateur', 0x1bc),
+    ('levels_normal', 0x1c0),
+    ('levels_veteran', 0x1c4),
+    ('levels_professional', 0x1c8),
+)
+COLUMNS = [column for column, name in SUMMARY] + [column for column, offset in LEVELS]
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS saves (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    status TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    {', '.join(f'{column} INTEGER' for column in COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS saves_steam_id ON saves (steam_id);
+CREATE INDEX IF NOT EXISTS saves_money ON saves (money);
+'''
+
+def connect(filename):
+    db = sqlite3.connect(filename)
+    db.executescript(SCHEMA)
+    return db
+
+def file_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+def extract(path):
+    # Summary values for a save that passed the size and signature checks
+    with RE5SaveView(path) as view:
+        values = [LAYOUT.get(view, name) for column, name in SUMMARY]
+        values += [view.get_value(offset, 2) for column, offset in LEVELS]
+    return values
+
+def update(db, paths, pattern='*.bin', prune=False):
+    stats = dict(added=0, updated=0, touched=0, unchanged=0, removed=0)
+    known = {row[0]: row[1:] for row in db.execute('SELECT path, mtime_ns, size, sha1 FROM saves')}
+    seen = set()
+    insert = f'''INSERT OR REPLACE INTO saves (path, mtime_ns, size, sha1, status, indexed_at, {', '.join(COLUMNS)})
+                 VALUES ({', '.join('?' * (6 + len(COLUMNS)))})'''
+
+    for path in walk(paths, pattern):
+        path = os.path.abspath(path)
+        seen.add(path)
+        stat = os.stat(path)
+        previous = known.get(path)
+        if previous is not None and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+            stats['unchanged'] += 1
+            continue
+
+        sha1 = file_hash(path)
+        if previous is not None and previous[2] == sha1:
+            db.execute('UPDATE saves SET mtime_ns = ?, size = ? WHERE path = ?', (stat.st_mtime_ns, stat.st_size, path))
+            stats['touched'] += 1
+            continue
+
+        status = classify(path)[1]
+        values = extract(path) if status in ('valid', 'corrupt-checksum') else [None] * len(COLUMNS)
+        db.execute(insert, (path, stat.st_mtime_ns, stat.st_size, sha1, status, time(), *values))
+        stats['updated' if previous is not None else 'added'] += 1
+
+    if prune:
+        for path in known.keys() - seen:
+            db.execute('DELETE FROM saves WHERE path = ?', (path,))
+            stats['removed'] += 1
+    db.commit()
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Index RE5 save summaries into SQLite.')
+    parser.add_argument('database', help='SQLite database file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    update_parser = commands.add_parser('update', help='add new and changed saves to the index')
+    update_parser.add_argument('paths', nargs='+', help='save files or directories to search')
+    update_parser.add_argument('-p', '--pattern', default='*.bin', help='file name pattern inside directories (default: %(default)s)')
+    update_parser.add_argument('--prune', action='store_true', help='drop indexed files that were not found')
+    query_parser = commands.add_parser('query', help='run an SQL query against the index')
+    query_parser.add_argument('sql')
+    args = parser.parse_args(argv)
+
+    db = connect(args.database)
+    if args.command == 'update':
+        start = perf_counter()
+        stats = update(db, args.paths, args.pattern, args.prune)
+        elapsed = perf_counter() - start
+        print(', '.join(f'{count} {name}' for name, count in stats.items()) + f' in {elapsed:.2f}s')
+    else:
+        cursor = db.execute(args.sql)
+        if cursor.description:
+            print('\t'.join(column[0] for column in cursor.description))
+            for row in cursor:
+                print('\t'.join('' if value is None else str(value) for value in row))
+        db.commit()
+    db.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
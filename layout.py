@@ -0,0 +1,332 @@
+import struct
+from dataclasses import dataclass
+
+FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+@dataclass(frozen=True)
+class Field:
+    name: str
+    offset: object # int, or a tuple of offsets whose chunks form one little-endian value
+    size: int = 1
+    bit: int = None # bit index counted from offset, like DCheckbutton
+
+    @property
+    def address(self):
+        return self.offset, self.size, self.bit
+
+    @property
+    def spans(self):
+        # (offset, size) of every byte range the field reads
+        if self.bit is not None:
+            return ((self.offset + self.bit // 8, 1),)
+        if type(self.offset) is tuple:
+            return tuple((offset, self.size) for offset in self.offset)
+        return ((self.offset, self.size),)
+
+def compile_groups(spans):
+    # Pack non-overlapping spans into as few struct.Struct unpackers as possible
+    groups = []
+    for offset, size in sorted(spans):
+        for group in groups:
+            if group[-1][0] + group[-1][1] <= offset:
+                group.append((offset, size))
+                break
+        else:
+            groups.append([(offset, size)])
+
+    compiled = []
+    for group in groups:
+        base = position = group[0][0]
+        fmt = '<'
+        for offset, size in group:
+            if offset > position:
+                fmt += f'{offset - position}x'
+            fmt += FORMATS.get(size, f'{size}s')
+            position = offset + size
+        compiled.append((base, position, struct.Struct(fmt), tuple(group)))
+    return compiled
+
+class Layout:
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.by_name = {}
+        self.by_address = {}
+        for field in self.fields:
+            if field.name in self.by_name:
+                raise ValueError(f'Field "{field.name}" is defined twice')
+            self.by_name[field.name] = field
+            self.by_address.setdefault(field.address, field)
+
+        self.groups = compile_groups({span for field in self.fields for span in field.spans})
+        index = {}
+        for base, end, unpacker, group in self.groups:
+            for span in group:
+                index[span] = len(index)
+        self.decoders = []
+        for field in self.fields:
+            slots = tuple(index[span] for span in field.spans)
+            if field.bit is not None:
+                self.decoders.append((field.name, slots[0], None, field.bit % 8))
+            elif len(slots) > 1:
+                self.decoders.append((field.name, None, slots, field.size * 8))
+            else:
+                self.decoders.append((field.name, slots[0], None, None))
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def __getitem__(self, name):
+        return self.by_name[name]
+
+    def lookup(self, offset, size=1, bit=None):
+        if type(offset) is list:
+            offset = tuple(offset)
+        if bit is not None:
+            size = 1
+        return self.by_address[(offset, size, bit)]
+
+    def unpack(self, data):
+        # data is the decoded buffer, or a save without one (RE5SaveView), which is then
+        # read one group at a time so only the chunks the groups cover are decoded
+        values = []
+        buffer = type(data) in (bytes, bytearray, memoryview)
+        for base, end, unpacker, group in self.groups:
+            if not buffer:
+                values.extend(unpacker.unpack(data.get_bytes(base, end - base).ljust(end - base, b'\0')))
+            elif end > len(data):
+                values.extend(unpacker.unpack(bytes(data[ base : end ]).ljust(end - base, b'\0')))
+            else:
+                values.extend(unpacker.unpack_from(data, base))
+        for i, value in enumerate(values):
+            if type(value) is bytes:
+                values[i] = int.from_bytes(value, 'little')
+        return values
+
+    def read(self, savedata):
+        values = self.unpack(savedata.data if savedata.data is not None else savedata)
+        record = {}
+        for name, slot, slots, shift in self.decoders:
+            if slots is not None:
+                value = 0
+                for i, part in enumerate(slots):
+                    value |= values[part] << (shift * i)
+                record[name] = value
+            elif shift is not None:
+                record[name] = values[slot] >> shift & 1
+            else:
+                record[name] = values[slot]
+        return record
+
+    def write(self, savedata, record):
+        # Flag bytes are read and written back under the save's lock, so bits set by
+        # another thread in between are not lost
+        with savedata.lock:
+            items = []
+            flag_bytes = {}
+            for name, value in record.items():
+                field = self.by_name[name]
+                if field.bit is not None:
+                    offset = field.offset + field.bit // 8
+                    chunk = flag_bytes.get(offset)
+                    if chunk is None:
+                        chunk = savedata.get_value(offset, 1)
+                    mask = 1 << (field.bit % 8)
+                    flag_bytes[offset] = chunk | mask if value else chunk & ~mask
+                elif type(field.offset) is tuple:
+                    chunks = int(value).to_bytes(len(field.offset) * field.size, 'little')
+                    for i, offset in enumerate(field.offset):
+                        items.append((chunks[ i*field.size : (i+1)*field.size ], offset, field.size))
+                else:
+                    items.append((int(value), field.offset, field.size))
+            items.extend((chunk, offset, 1) for offset, chunk in flag_bytes.items())
+            savedata.set_many(items)
+
+    def get(self, savedata, name):
+        field = self.by_name[name]
+        if field.bit is not None:
+            return savedata.get_bit(field.offset, field.bit)
+        if type(field.offset) is tuple:
+            chunks = b''.join(savedata.get_bytes(offset, field.size) for offset in field.offset)
+            return int.from_bytes(chunks, 'little')
+        return savedata.get_value(field.offset, field.size)
+
+    def set(self, savedata, name, value):
+        self.write(savedata, {name: value})
+
+
+def bit_fields(name, offset, count):
+    return [Field(f'{name}[{i}]', offset, bit=i) for i in range(count)]
+
+class Table:
+    # Fixed-stride array of records, every row unpacked with one precompiled struct
+    def __init__(self, name, offset, count, stride, columns):
+        self.name = name
+        self.offset = offset
+        self.count = count
+        self.stride = stride
+        self.columns = dict((column, (column_offset, size)) for column, column_offset, size in columns)
+
+        fmt = '<'
+        position = 0
+        self.index = {}
+        for column, (column_offset, size) in sorted(self.columns.items(), key=lambda item: item[1]):
+            if column_offset < position:
+                raise ValueError(f'Column "{column}" of table "{name}" overlaps the previous one')
+            if column_offset > position:
+                fmt += f'{column_offset - position}x'
+            fmt += FORMATS.get(size, f'{size}s')
+            self.index[column] = len(self.index)
+            position = column_offset + size
+        fmt += f'{stride - position}x'
+        self.row = struct.Struct(fmt)
+
+    def fields(self):
+        fields = []
+        for i in range(self.count):
+            for column, (column_offset, size) in self.columns.items():
+                fields.append(Field(f'{self.name}[{i}].{column}', self.offset + i*self.stride + column_offset, size))
+        return fields
+
+    def field_offset(self, i, column):
+        return self.offset + i*self.stride + self.columns[column][0]
+
+    def unpack(self, savedata):
+        rows = []
+        for values in self.row.iter_unpack(savedata.get_bytes(self.offset, self.count * self.stride)):
+            rows.append([int.from_bytes(value, 'little') if type(value) is bytes else value for value in values])
+        return rows
+
+    def read(self, savedata):
+        return [{column: values[self.index[column]] for column in self.columns} for values in self.unpack(savedata)]
+
+    def column(self, savedata, column):
+        position = self.index[column]
+        return [values[position] for values in self.unpack(savedata)]
+
+    def write_column(self, savedata, column, values, rows=None):
+        # values is one value for every row, or a sequence matched up with rows
+        if rows is None:
+            rows = range(self.count)
+        if type(values) is int:
+            values = [values] * len(rows)
+        column_offset, size = self.columns[column]
+        savedata.set_many((int(value), self.offset + i*self.stride + column_offset, size) for i, value in zip(rows, values))
+
+    def write_rows(self, savedata, rows):
+        # rows: {row index: {column: value}}
+        items = []
+        for i, values in rows.items():
+            for column, value in values.items():
+                column_offset, size = self.columns[column]
+                items.append((int(value), self.offset + i*self.stride + column_offset, size))
+        savedata.set_many(items)
+
+    def view(self, savedata):
+        return TableView(self, savedata)
+
+class TableView:
+    # view['qty'] reads a column, view['qty'] = 99 sets it for every row, view[3] is a row dict
+    def __init__(self, table, savedata):
+        self.table = table
+        self.savedata = savedata
+
+    def __len__(self):
+        return self.table.count
+
+    def __getitem__(self, key):
+        if type(key) is str:
+            return self.table.column(self.savedata, key)
+        return self.table.read(self.savedata)[key]
+
+    def __setitem__(self, key, value):
+        if type(key) is str:
+            self.table.write_column(self.savedata, key, value)
+        else:
+            self.table.write_rows(self.savedata, {key: value})
+
+    def rows(self):
+        return self.table.read(self.savedata)
+
+INVENTORY_COLUMNS = (
+    # (column, offset in slot, size)
+    ('item', 0, 2),
+    ('qty', 4, 4),
+    ('max', 8, 4),
+    ('damage', 28, 1),
+    ('extra', 29, 1), # 'R' column in the GUI, 102 when set
+    ('reload', 30, 1),
+    ('capacity', 31, 1), # 127 is infinite
+    ('critical', 33, 1),
+    ('piercing', 34, 1),
+    ('range', 35, 1),
+    ('zoom', 36, 1),
+)
+TABLES = {
+    'inventory.chris': Table('inventory.chris', 0x3d80, 10, 0x2C, INVENTORY_COLUMNS),
+    'inventory.sheva': Table('inventory.sheva', 0x41a0, 10, 0x2C, INVENTORY_COLUMNS),
+    'treasure': Table('treasure', 0x3ad4, 50, 0x4, (('item', 0, 2), ('qty', 2, 1))),
+}
+
+BLOCKS = {
+    # name: (offset, number of flags)
+    'outfits.chris': (0x124, 5),
+    'outfits.sheva': (0x128, 5),
+    'filters': (0x12c, 4),
+    'infinite_ammo': (0x130, 19),
+    'files': (0x134, 12),
+    'figures': (0x138, 46),
+    'cutscenes': (0x140, 53),
+    'shop': (0x148, 33),
+    'bonus': (0x158, 53),
+    'versus_characters': (0x180, 8),
+    'levels.amateur': (0x1bc, 16),
+    'levels.normal': (0x1c0, 16),
+    'levels.veteran': (0x1c4, 16),
+    'levels.professional': (0x1c8, 16),
+}
+
+FIELDS = [
+    Field('steam_id', 0x0, 4),
+    Field('last_save.year', 0x10, 4),
+    Field('last_save.month', 0x14, 4),
+    Field('last_save.day', 0x18, 4),
+    Field('last_save.hour', 0x1c, 4),
+    Field('last_save.minute', 0x20, 4),
+    Field('last_save.second', 0x24, 4),
+    Field('chris_costume', (0x50, 0x5d44), 4),
+    Field('sheva_costume', (0x54, 0x5d48), 4),
+    Field('filter', 0x58, 4),
+    Field('infinite_ammo_mode', 0x5C, bit=0),
+    Field('versus.melee_kills', 0x182, 2),
+    Field('playtime', 0x18c, 4),
+    Field('money', 0x194, 4),
+    Field('exchange_points', 0x198, 4),
+    Field('versus.slayers.played', 0x0C98, 4),
+    Field('versus.slayers.won', 0x0C9C, 4),
+    Field('versus.survivors.played', 0x12D8, 4),
+    Field('versus.survivors.won', 0x12DC, 4),
+    Field('versus.team_slayers.played', 0x1990, 4),
+    Field('versus.team_slayers.won', 0x1994, 4),
+    Field('versus.team_survivors.played', 0x1FD0, 4),
+    Field('versus.team_survivors.won', 0x1FD4, 4),
+    Field('current.state', 0x3bb0, 4),
+    Field('current.character', 0x3bb4, 1),
+    Field('current.difficulty', 0x3bb8, 4),
+    Field('current.area', (0x3bc0, 0x3bc8), 4),
+    Field('chris.exists', 0x3C40, bit=0),
+    Field('chris.hp', 0x3C50, 4),
+    Field('chris.hp_max', 0x3c54, 4),
+    Field('sheva.exists', 0x3C90, bit=0),
+    Field('sheva.hp', 0x3CA0, 4),
+    Field('sheva.hp_max', 0x3CA4, 4),
+    *[field for name, (offset, count) in BLOCKS.items() for field in bit_fields(name, offset, count)],
+    *[field for table in TABLES.values() for field in table.fields()],
+]
+
+LAYOUT = Layout(FIELDS)
@@ -0,0 +1,144 @@
+import argparse
+import fnmatch
+import io
+import shutil
+import sys
+import tarfile
+import time
+import zipfile
+from dataclasses import dataclass
+from time import perf_counter
+from batch import apply_edits, load_spec
+from editor import RE5SaveData, SIZE_MIN, SIZE_MAX
+
+# Streams saves from one zip/tar archive to another. Only a save being edited is held
+# in memory, other members are copied through in blocks.
+# Use "-" for stdin/stdout (tar only on input, --format picks the output format).
+
+@dataclass
+class Member:
+    # Members from read_archive() stream from file until read() loads their data
+    name: str
+    data: bytes = None
+    mtime: float = None
+    mode: int = 0o644
+    size: int = None
+    file: object = None
+
+    @property
+    def length(self):
+        return self.size if self.data is None else len(self.data)
+
+    def read(self):
+        if self.data is None:
+            self.data = self.file.read()
+            self.file = None
+        return self.data
+
+def archive_format(name):
+    for suffix, fmt in (('.zip', 'zip'), ('.tar.gz', 'tar.gz'), ('.tgz', 'tar.gz'), ('.tar.bz2', 'tar.bz2'), ('.tar.xz', 'tar.xz'), ('.tar', 'tar')):
+        if name.lower().endswith(suffix):
+            return fmt
+    return None
+
+def read_archive(source):
+    # source: path, "-" or binary file object. Yields Member for every regular file;
+    # its file is only valid until the next member is requested.
+    if source == '-':
+        source = sys.stdin.buffer
+    if type(source) is str and zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    mtime = time.mktime(info.date_time + (0, 0, -1))
+                    with archive.open(info) as file:
+                        yield Member(info.filename, None, mtime, (info.external_attr >> 16) or 0o644, info.file_size, file)
+        return
+    if type(source) is str:
+        archive = tarfile.open(source, 'r:*')
+    else:
+        archive = tarfile.open(fileobj=source, mode='r|*')
+    with archive:
+        for info in archive:
+            if info.isfile():
+                with archive.extractfile(info) as file:
+                    yield Member(info.name, None, info.mtime, info.mode, info.size, file)
+
+def write_archive(target, members, fmt):
+    # Consumes members as they come; target is a path, "-" or a binary file object
+    if target == '-':
+        target = sys.stdout.buffer
+    if fmt == 'zip':
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for member in members:
+                info = zipfile.ZipInfo(member.name, time.localtime(member.mtime or time.time())[:6])
+                info.external_attr = member.mode << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                if member.data is not None:
+                    archive.writestr(info, member.data)
+                else:
+                    with archive.open(info, 'w', force_zip64=member.size >= zipfile.ZIP64_LIMIT) as file:
+                        shutil.copyfileobj(member.file, file)
+        return
+    compression = fmt.partition('.')[2]
+    if type(target) is str:
+        archive = tarfile.open(target, f'w:{compression}')
+    else:
+        archive = tarfile.open(fileobj=target, mode=f'w|{compression}')
+    with archive:
+        for member in members:
+            info = tarfile.TarInfo(member.name)
+            info.size = member.length
+            info.mtime = member.mtime or time.time()
+            info.mode = member.mode
+            archive.addfile(info, member.file if member.data is None else io.BytesIO(member.data))
+
+def transform_saves(members, transform, pattern='*.bin', report=None):
+    # Decodes matching members, applies transform(savedata) and re-encodes them.
+    # Everything else passes through unchanged. report(name, status) is called per member.
+    for member in members:
+        status = 'skipped'
+        if fnmatch.fnmatch(member.name.rsplit('/', 1)[-1], pattern):
+            savedata = RE5SaveData()
+            if member.length < SIZE_MIN or member.length > SIZE_MAX:
+                status = 'wrong-size'
+            else:
+                savedata.open_file(member.read())
+                if not savedata.check_signature():
+                    status = 'wrong-signature'
+                else:
+                    transform(savedata)
+                    member.data = savedata.to_bytes()
+                    status = 'ok'
+        if report is not None:
+            report(member.name, status)
+        yield member
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply an edit spec to the saves inside an archive, writing a new archive.')
+    parser.add_argument('spec', help='JSON edit spec, see batch.py')
+    parser.add_argument('source', help='input .zip/.tar[.gz|.bz2|.xz], or - for a tar stream on stdin')
+    parser.add_argument('target', help='output archive, or - for stdout')
+    parser.add_argument('-p', '--pattern', default='*.bin', help='member file name pattern to edit (default: %(default)s)')
+    parser.add_argument('-f', '--format', choices=('zip', 'tar', 'tar.gz', 'tar.bz2', 'tar.xz'), help='output format (default: from the target name, else tar)')
+    args = parser.parse_args(argv)
+
+    edits = load_spec(args.spec)
+    fmt = args.format or archive_format(args.target) or 'tar'
+    counts = dict()
+
+    def report(name, status):
+        counts[status] = counts.get(status, 0) + 1
+        if status not in ('ok', 'skipped'):
+            print(f'{status}\t{name}', file=sys.stderr)
+
+    start = perf_counter()
+    members = transform_saves(read_archive(args.source), lambda savedata: apply_edits(savedata, edits), args.pattern, report)
+    write_archive(args.target, members, fmt)
+    elapsed = perf_counter() - start
+    print(', '.join(f'{count} {status}' for status, count in counts.items()) + f' in {elapsed:.2f}s', file=sys.stderr)
+    return 0 if set(counts) <= {'ok', 'skipped'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import sys
+from functools import partial
+from batch import add_job_arguments, parse_edit, run
+from layout import LAYOUT, TABLES
+
+# Named edit presets. A preset is a batch.py spec, compiled once into byte-level AND/OR
+# masks: applying it reads each masked stretch of the save, computes
+# (bytes & AND) | OR on the whole stretch at once and writes back only what changed,
+# as one undo step. User presets live in presets.json next to this file (or a file
+# passed with --presets), in the same shape as BUILTIN:
+#   {"max-money": {"description": "...", "edits": [{"field": "money", "value": 9999999}]}}
+
+UNLOCK_BLOCKS = {
+    'unlock-shop': ('Every weapon in the shop', ('shop',)),
+    'unlock-bonus': ('Every bonus feature', ('bonus',)),
+    'unlock-figures': ('Every figure', ('figures',)),
+    'unlock-cutscenes': ('Every cutscene in the theater', ('cutscenes',)),
+    'unlock-files': ('Every library file', ('files',)),
+    'infinite-ammo': ('Infinite ammo for every weapon', ('infinite_ammo',)),
+    'unlock-outfits': ('Every outfit for Chris and Sheva', ('outfits.chris', 'outfits.sheva')),
+    'unlock-levels': ('Every chapter on every difficulty', ('levels.amateur', 'levels.normal', 'levels.veteran', 'levels.professional')),
+}
+ALL_BLOCKS = tuple(block for description, blocks in UNLOCK_BLOCKS.values() for block in blocks)
+
+BUILTIN = {
+    'unlock-all': {
+        'description': 'Shop, bonus, figures, cutscenes, files, infinite ammo, outfits and levels',
+        'edits': [{'block': block, 'op': 'set_all'} for block in ALL_BLOCKS],
+    },
+    'lock-all': {
+        'description': 'Clear everything unlock-all sets',
+        'edits': [{'block': block, 'op': 'clear_all'} for block in ALL_BLOCKS],
+    },
+    **{name: {
+        'description': description,
+        'edits': [{'block': block, 'op': 'set_all'} for block in blocks],
+    } for name, (description, blocks) in UNLOCK_BLOCKS.items()},
+}
+USER_PRESETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'presets.json')
+SEGMENT_GAP = 16 # Untouched bytes a segment may span instead of starting a new one
+
+def edit_masks(edit):
+    # (offset, and byte, or byte) for every byte a parsed batch edit writes
+    kind = edit[0]
+    if kind == 'mask':
+        offset, length, and_mask, or_mask = edit[1:]
+        return [(offset + i, and_mask >> (8*i) & 0xFF, or_mask >> (8*i) & 0xFF) for i in range(length)]
+    if kind == 'value':
+        offset, size, value = edit[1:]
+        return [(offset + i, 0, byte) for i, byte in enumerate(value.to_bytes(size, 'little'))]
+    if kind == 'bytes':
+        offset, data = edit[1:]
+        return [(offset + i, 0, byte) for i, byte in enumerate(data)]
+    if kind == 'field':
+        field = LAYOUT[edit[1]]
+        if field.bit is not None:
+            bit = 1 << (field.bit % 8)
+            return [(field.offset + field.bit // 8, 0xFF & ~bit, bit if edit[2] else 0)]
+        data = edit[2].to_bytes(field.size * len(field.spans), 'little')
+        return [(offset + i, 0, data[ j*size + i ]) for j, (offset, size) in enumerate(field.spans) for i in range(size)]
+    if kind == 'column':
+        table = TABLES[edit[1]]
+        column_offset, size = table.columns[edit[2]]
+        data = edit[3].to_bytes(size, 'little')
+        return [(table.offset + row*table.stride + column_offset + i, 0, byte) for row in edit[4] for i, byte in enumerate(data)]
+    raise ValueError(f'Unknown edit kind {kind}')
+
+class Preset:
+    def __init__(self, name, edits, description=''):
+        self.name = name
+        self.description = description
+        self.edits = [parse_edit(entry) for entry in edits]
+
+        # Later edits are composed onto earlier ones: ((x & a1) | o1) & a2 | o2
+        masks = {}
+        for edit in self.edits:
+            for offset, and_byte, or_byte in edit_masks(edit):
+                previous = masks.get(offset)
+                if previous is not None:
+                    and_byte, or_byte = previous[0] & and_byte, (previous[1] & and_byte) | or_byte
+                masks[offset] = (and_byte, or_byte)
+
+        # Contiguous segments of (offset, length, AND as int, OR as int)
+        self.segments = []
+        start = end = None
+        for offset in sorted(masks) + [None]:
+            if offset is not None and end is not None and offset - end <= SEGMENT_GAP:
+                end = offset + 1
+                continue
+            if start is not None:
+                and_bytes = bytes(masks.get(i, (0xFF, 0))[0] for i in range(start, end))
+                or_bytes = bytes(masks.get(i, (0xFF, 0))[1] for i in range(start, end))
+                self.segments.append((start, end - start, int.from_bytes(and_bytes, 'little'), int.from_bytes(or_bytes, 'little')))
+            if offset is not None:
+                start, end = offset, offset + 1
+
+    def apply(self, savedata):
+        # One masked pass per segment, written as one set_many with the running checksum
+        # updated along the way. Returns the number of segments that changed.
+        with savedata.lock:
+            items = []
+            for offset, length, and_mask, or_mask in self.segments:
+                current = savedata.get_value(offset, length)
+                value = (current & and_mask) | or_mask
+                if value != current:
+                    items.append((value.to_bytes(length, 'little'), offset, length))
+            savedata.set_many(items)
+            return len(items)
+
+def apply_presets(savedata, presets):
+    for preset in presets:
+        preset.apply(savedata)
+
+def compile_presets(definitions):
+    return {name: Preset(name, definition['edits'], definition.get('description', '')) for name, definition in definitions.items()}
+
+def load_presets(filename=None):
+    # Built-in presets plus user presets from filename (default USER_PRESETS if it exists),
+    # a user preset replaces a built-in one of the same name
+    definitions = dict(BUILTIN)
+    if filename is None and os.path.exists(USER_PRESETS):
+        filename = USER_PRESETS
+    if filename is not None:
+        with open(filename, encoding='utf-8') as file:
+            definitions.update(json.load(file))
+    return compile_presets(definitions)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply named edit presets to RE5 saves.')
+    parser.add_argument('--presets', help=f'JSON file with user presets (default: {os.path.basename(USER_PRESETS)} if present)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='list the available presets')
+    apply_parser = commands.add_parser('apply', help='apply presets to save files')
+    apply_parser.add_argument('names', help='preset name, or several separated by commas')
+    add_job_arguments(apply_parser)
+    args = parser.parse_args(argv)
+
+    presets = load_presets(args.presets)
+    if args.command == 'list':
+        for name, preset in presets.items():
+            print(f'{name:<18} {preset.description}')
+        return 0
+
+    try:
+        chosen = [presets[name] for name in args.names.split(',')]
+    except KeyError as error:
+        parser.error(f'unknown preset {error}')
+    return run(apply_parser, args, partial(apply_presets, presets=chosen))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
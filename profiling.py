@@ -0,0 +1,120 @@
+import atexit
+import cProfile
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from time import perf_counter
+
+# Opt-in timing of the hot paths. Nothing is wrapped until configure() turns it on,
+# so a normal run pays nothing. Turn it on with
+#   RE5_PROFILE=report.json [RE5_CPROFILE=dump.prof] python gui.py
+# or python gui.py --profile report.json [--cprofile dump.prof].
+# The JSON report is written at exit: per wrapped function its call count, total,
+# mean and max time. The cProfile dump only covers the main thread.
+
+REPORT_ENV = 'RE5_PROFILE'
+CPROFILE_ENV = 'RE5_CPROFILE'
+
+EDITOR_FUNCTIONS = ('decode', 'encode', 'decode_range', 'checksum', 'write_atomic')
+EDITOR_METHODS = (
+    'open_file', 'to_bytes', 'save_file', 'calculate_checksum', 'update_checksum',
+    'get_bytes', 'get_value', 'set_bytes', 'set_value', 'set_many', 'get_bit', 'set_bit',
+    'get_bits', 'set_bits', 'apply_mask', 'snapshot', 'undo', 'redo', 'revert', 'flush',
+)
+LAYOUT_METHODS = ('read', 'write', 'get', 'set')
+
+stats = {} # name: [count, total seconds, max seconds]
+lock = threading.Lock()
+session = None # Set by configure() once profiling is on
+
+def record(name, elapsed):
+    with lock:
+        entry = stats.get(name)
+        if entry is None:
+            stats[name] = [1, elapsed, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+def timed(function, name, key=None):
+    # key(*args) names the call instead of name, e.g. one entry per tab
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(name if key is None else key(*args), perf_counter() - start)
+    wrapper.profiled = True
+    return wrapper
+
+def instrument(owner, names, prefix=None, key=None):
+    # Wraps the named functions of a class or module (or a module's globals() dict)
+    # that it defines itself. Does nothing while profiling is off.
+    if session is None:
+        return
+    namespace = owner if type(owner) is dict else vars(owner)
+    if prefix is None:
+        prefix = owner['__name__'] if type(owner) is dict else owner.__name__
+    for name in names:
+        function = namespace.get(name)
+        if function is None or getattr(function, 'profiled', False):
+            continue
+        wrapper = timed(function, f'{prefix}.{name}', key)
+        if type(owner) is dict:
+            owner[name] = wrapper
+        else:
+            setattr(owner, name, wrapper)
+
+def report():
+    with lock:
+        calls = {name: {'count': count, 'total': total, 'mean': total / count, 'max': longest}
+                 for name, (count, total, longest) in sorted(stats.items())}
+    return {
+        'started': session['started'],
+        'duration': perf_counter() - session['start'],
+        'argv': sys.argv,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'calls': calls,
+    }
+
+def finish():
+    if session['profiler'] is not None:
+        session['profiler'].disable()
+        session['profiler'].dump_stats(session['cprofile'])
+    if session['report'] is not None:
+        with open(session['report'], 'w', encoding='utf-8') as file:
+            json.dump(report(), file, indent=1)
+
+def configure(report_path=None, cprofile_path=None):
+    # Turns profiling on if a report or dump path is given here or in the environment.
+    # Returns whether it is on. The editor, layout and descr hot paths are wrapped here,
+    # callers add their own with instrument().
+    global session
+    report_path = report_path or os.environ.get(REPORT_ENV)
+    cprofile_path = cprofile_path or os.environ.get(CPROFILE_ENV)
+    if session is not None or not (report_path or cprofile_path):
+        return session is not None
+
+    session = {'report': report_path, 'cprofile': cprofile_path, 'profiler': None,
+               'started': time.strftime('%Y-%m-%dT%H:%M:%S'), 'start': perf_counter()}
+    import editor
+    import layout
+    from descr import DTabFrame
+    instrument(vars(editor), EDITOR_FUNCTIONS, 'editor')
+    for cls in (editor.RE5SaveData, editor.RE5SaveSnapshot, editor.RE5SaveView, editor.RE5SavePatch):
+        instrument(cls, EDITOR_METHODS)
+    instrument(layout.Layout, LAYOUT_METHODS)
+    instrument(DTabFrame, ('create',), key=lambda frame, *args: f'DTabFrame.create[{frame.label}]')
+    if cprofile_path:
+        session['profiler'] = cProfile.Profile()
+        session['profiler'].enable()
+    atexit.register(finish)
+    return True
@@ -0,0 +1,87 @@
+import argparse
+import fnmatch
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from editor import RE5SaveView, SIZE_MIN, SIZE_MAX
+
+# Classifies save files without decoding them in full: the size comes from stat,
+# the signature from four chunk pairs and the checksum from its two regions.
+
+CLASSES = ('valid', 'corrupt-checksum', 'wrong-signature', 'wrong-size', 'unreadable')
+
+def classify(path):
+    try:
+        size = os.path.getsize(path)
+        if size < SIZE_MIN or size > SIZE_MAX:
+            return path, 'wrong-size'
+        with RE5SaveView(path) as view:
+            if not view.check_signature():
+                return path, 'wrong-signature'
+            if not view.verify_checksum():
+                return path, 'corrupt-checksum'
+        return path, 'valid'
+    except (OSError, ValueError):
+        return path, 'unreadable'
+
+def walk(paths, pattern):
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if fnmatch.fnmatch(filename, pattern):
+                        yield os.path.join(dirpath, filename)
+        else:
+            yield path
+
+def find_files(paths, pattern):
+    # walk() paired with each path relative to the argument it was found under
+    for path in paths:
+        for full in walk((path,), pattern):
+            yield full, os.path.basename(full) if full == path else os.path.relpath(full, path)
+
+def scan(paths, pattern='*.bin', jobs=None):
+    # Yields (path, class) in walk order
+    files = list(walk(paths, pattern))
+    if jobs == 1:
+        yield from map(classify, files)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(classify, files, chunksize=max(1, min(512, len(files) // 64)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate and classify RE5 save files.')
+    parser.add_argument('paths', nargs='+', help='save files or directories to search')
+    parser.add_argument('-p', '--pattern', default='*.bin', help='file name pattern inside directories (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('-a', '--all', action='store_true', help='also list valid files')
+    parser.add_argument('--json', help='write {path: class} to this file')
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    counts = Counter()
+    report = dict()
+    for path, status in scan(args.paths, args.pattern, args.jobs):
+        counts[status] += 1
+        if args.json:
+            report[path] = status
+        if args.all or status != 'valid':
+            print(f'{status}\t{path}')
+    elapsed = perf_counter() - start
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=1)
+    total = sum(counts.values())
+    summary = ', '.join(f'{counts[status]} {status}' for status in CLASSES if counts[status])
+    rate = total / elapsed if elapsed else 0.0
+    print(f'{total} files in {elapsed:.2f}s ({rate:.0f} files/s): {summary or "nothing found"}', file=sys.stderr)
+    return 0 if counts['valid'] == total else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
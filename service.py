@@ -0,0 +1,351 @@
+import argparse
+import http.client
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import profiling
+from batch import apply_edits, parse_edit, parse_int
+from editor import RE5SaveData, SIZE_MIN, SIZE_MAX
+from export import select_fields
+from layout import BLOCKS, LAYOUT
+from descr import field_enum
+
+# JSON-RPC 2.0 over HTTP POST, on localhost or a Unix socket. Decoded saves stay in an
+# LRU cache keyed by path, mtime and size, so repeated queries skip the decode.
+#
+#   get       {"path", "fields": [names or patterns], "labels": false} -> {name: value}
+#   set       {"path", "values": {name: value}} -> {"changed": n}, saved atomically
+#   edit      {"path", "edits": [batch.py spec entries]} -> {"changed": n}
+#   bits      {"path", "block"} or {"path", "offset", "count"} -> [bool, ...]
+#   validate  {"path"} -> scan.py class
+#   export    {"path", "fields": [patterns], "labels": false} -> every matching field
+#   stats     {} -> cache counters
+#
+# Example: curl -H 'Content-Type: application/json' -d '{"jsonrpc": "2.0", "id": 1, "method": "get", "params": {"path": "savedata.bin", "fields": ["money"]}}' localhost:8765
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SAVE_ERROR = -32000 # File missing, unreadable or not a save
+
+class SaveError(Exception):
+    def __init__(self, status, path):
+        super().__init__(f'{path}: {status}')
+        self.status = status
+
+class Entry:
+    def __init__(self, savedata, key):
+        self.savedata = savedata
+        self.key = key # (mtime_ns, size) of the file the data was read from
+
+class SaveCache:
+    # Decoded saves by path, least recently used dropped first once max_bytes is exceeded
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.path_locks = {}
+        self.stats = dict(hits=0, misses=0, evictions=0)
+
+    def lock_for(self, path):
+        # Held by edits around the lookup and write-back of one file, so an edit never works
+        # on a stale copy. Reads take a snapshot instead.
+        with self.lock:
+            return self.path_locks.setdefault(path, threading.Lock())
+
+    def get(self, path):
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry.key == key:
+                self.entries.move_to_end(path)
+                self.stats['hits'] += 1
+                return entry
+            self.stats['misses'] += 1
+
+        # Decoded outside the cache lock, so loads of different files run side by side
+        if stat.st_size < SIZE_MIN or stat.st_size > SIZE_MAX:
+            raise SaveError('wrong-size', path)
+        savedata = RE5SaveData()
+        with open(path, 'rb') as file:
+            savedata.open_file(file)
+        if not savedata.check_signature():
+            raise SaveError('wrong-signature', path)
+        return self.put(path, Entry(savedata, key))
+
+    def put(self, path, entry):
+        with self.lock:
+            previous = self.entries.pop(path, None)
+            if previous is not None:
+                self.bytes -= len(previous.savedata.data)
+            self.entries[path] = entry
+            self.bytes += len(entry.savedata.data)
+            while self.bytes > self.max_bytes and len(self.entries) > 1:
+                path, dropped = self.entries.popitem(last=False)
+                self.bytes -= len(dropped.savedata.data)
+                self.stats['evictions'] += 1
+        return entry
+
+    def saved(self, path, entry):
+        # The file was rewritten from entry.savedata, which stays valid for the new mtime
+        stat = os.stat(path)
+        entry.key = (stat.st_mtime_ns, stat.st_size)
+        self.put(path, entry)
+
+    def info(self):
+        with self.lock:
+            return dict(self.stats, entries=len(self.entries), bytes=self.bytes, max_bytes=self.max_bytes)
+
+class SaveService:
+    def __init__(self, cache=None, root=None):
+        self.cache = cache if cache is not None else SaveCache()
+        self.root = os.path.realpath(root) if root is not None else None
+        self.methods = {
+            'get': self.get,
+            'set': self.set,
+            'edit': self.edit,
+            'bits': self.bits,
+            'validate': self.validate,
+            'export': self.export,
+            'stats': self.stats,
+        }
+
+    def resolve(self, path):
+        # Paths are taken relative to the root and may not leave it. Without a root they
+        # are relative to the working directory, and absolute paths are refused.
+        root = self.root
+        if root is None:
+            if os.path.isabs(path):
+                raise ValueError(f'{path} is absolute, which needs a service root')
+            root = os.path.realpath(os.getcwd())
+        full = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([full, root]) != root:
+            raise ValueError(f'{path} is outside the service root')
+        return full
+
+    def values(self, savedata, fields, labels):
+        record = LAYOUT.read(savedata)
+        values = {}
+        for field in fields:
+            value = record[field.name]
+            enum = field_enum(field.name) if labels else None
+            if field.bit is not None:
+                value = bool(value)
+            elif enum is not None:
+                value = enum.label(value)
+            values[field.name] = value
+        return values
+
+    def get(self, path, fields, labels=False):
+        if type(fields) is str:
+            fields = [fields]
+        return self.export(path, fields, labels)
+
+    def export(self, path, fields=None, labels=False):
+        # Reads work on a snapshot and do not wait for edits of the same file
+        snapshot = self.cache.get(self.resolve(path)).savedata.snapshot()
+        return self.values(snapshot, select_fields(fields), labels)
+
+    def apply(self, path, edits):
+        # Edits the cached save and writes it back atomically. Readers see the edits once
+        # the file is written; if an edit or the write fails, all of them are rolled back.
+        path = self.resolve(path)
+        with self.cache.lock_for(path):
+            entry = self.cache.get(path)
+            savedata = entry.savedata
+            with savedata.transaction():
+                apply_edits(savedata, edits)
+                changed = sum(len(step) for step in savedata.journal)
+                if changed:
+                    savedata.save_file(path)
+            if changed:
+                self.cache.saved(path, entry)
+            # The file is the new base for revert()
+            savedata.journal.clear()
+            savedata.journal_pos = 0
+            savedata.trimmed.clear()
+        return {'changed': changed}
+
+    def set(self, path, values):
+        return self.apply(path, [parse_edit({'field': name, 'value': value}) for name, value in values.items()])
+
+    def edit(self, path, edits):
+        return self.apply(path, [parse_edit(entry) for entry in edits])
+
+    def bits(self, path, block=None, offset=None, count=None):
+        if block is not None:
+            offset, count = BLOCKS[block]
+        snapshot = self.cache.get(self.resolve(path)).savedata.snapshot()
+        return snapshot.get_bits(parse_int(offset), parse_int(count))
+
+    def validate(self, path):
+        try:
+            snapshot = self.cache.get(self.resolve(path)).savedata.snapshot()
+        except SaveError as error:
+            return error.status
+        except OSError:
+            return 'unreadable'
+        return 'valid' if snapshot.verify_checksum() else 'corrupt-checksum'
+
+    def stats(self):
+        return self.cache.info()
+
+    def call(self, request):
+        # One JSON-RPC request object to its response, None for notifications
+        if type(request) is not dict or type(request.get('method')) is not str:
+            return error_response(None, INVALID_REQUEST, 'Invalid Request')
+        request_id = request.get('id')
+        method = self.methods.get(request['method'])
+        if method is None:
+            return error_response(request_id, METHOD_NOT_FOUND, f'Method not found: {request["method"]}')
+        params = request.get('params', {})
+        try:
+            if type(params) is list:
+                result = method(*params)
+            else:
+                result = method(**params)
+        except SaveError as error:
+            return error_response(request_id, SAVE_ERROR, str(error), error.status)
+        except OSError as error:
+            return error_response(request_id, SAVE_ERROR, str(error), 'unreadable')
+        except (KeyError, ValueError, TypeError, OverflowError) as error:
+            return error_response(request_id, INVALID_PARAMS, f'Invalid params: {error}')
+        except Exception as error:
+            return error_response(request_id, INTERNAL_ERROR, f'Internal error: {error}')
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def handle(self, body):
+        # Raw request body to the response body, b'' when nothing is answered
+        try:
+            request = json.loads(body)
+        except ValueError as error:
+            response = error_response(None, PARSE_ERROR, f'Parse error: {error}')
+        else:
+            if type(request) is list:
+                response = [answer for answer in map(self.call, request) if answer is not None] if request else error_response(None, INVALID_REQUEST, 'Invalid Request')
+            else:
+                response = self.call(request)
+        if not response:
+            return b''
+        return json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+def error_response(request_id, code, message, data=None):
+    error = {'code': code, 'message': message}
+    if data is not None:
+        error['data'] = data
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': error}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    quiet = False
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.headers.get_content_type() != 'application/json':
+            # Browsers send text/plain and form posts cross-origin without asking first
+            response = json.dumps(error_response(None, INVALID_REQUEST, 'Content-Type must be application/json')).encode('utf-8')
+            self.send_response(415)
+        else:
+            response = self.server.service.handle(body)
+            self.send_response(200 if response else 204)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+class TCPHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 64 # Clients fanning out over a thread pool overflow the default 5
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+    def get_request(self):
+        # Unix socket peers have no address, the request log wants one
+        request, address = super().get_request()
+        return request, ('unix', 0)
+
+def make_server(service, host='127.0.0.1', port=8765, socket_path=None):
+    # Threaded server, one thread per connection; serve_forever() runs it
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, Handler)
+    else:
+        server = TCPHTTPServer((host, port), Handler)
+    server.service = service
+    return server
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def call(address, method, params=None, request_id=1):
+    # Client side: address is (host, port) or a Unix socket path. Returns the result,
+    # raises RuntimeError with the JSON-RPC error object otherwise.
+    if type(address) is str:
+        connection = UnixHTTPConnection(address)
+    else:
+        connection = http.client.HTTPConnection(*address)
+    body = json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params or {}})
+    try:
+        connection.request('POST', '/', body, {'Content-Type': 'application/json'})
+        response = json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response['result']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve RE5 saves over JSON-RPC on localhost.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (default: %(default)s)')
+    parser.add_argument('--socket', help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--root', help='only serve saves below this directory, paths are relative to it (default: the working directory)')
+    parser.add_argument('--cache-mb', type=float, default=64, help='decoded saves kept in memory (default: %(default)s MiB)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not log requests')
+    parser.add_argument('--profile', metavar='REPORT', help='write a JSON timing report here at exit, see profiling.py')
+    args = parser.parse_args(argv)
+
+    if profiling.configure(args.profile):
+        profiling.instrument(SaveService, ('get', 'set', 'edit', 'bits', 'validate', 'export'))
+        profiling.instrument(SaveCache, ('get',))
+    Handler.quiet = args.quiet
+    service = SaveService(SaveCache(int(args.cache_mb * 2**20)), args.root)
+    server = make_server(service, args.host, args.port, args.socket)
+    where = args.socket or f'http://{args.host}:{server.server_address[1]}'
+    print(f'Serving saves on {where}', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket:
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    sys.exit(main())